@@ -0,0 +1,35 @@
+"""Add claimed_at dispatch lease to background_checks
+
+Revision ID: 3b7e21c9d4a0
+Revises: 968343f98482
+Create Date: 2025-09-21 10:02:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e21c9d4a0'
+down_revision: Union[str, None] = '968343f98482'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('background_checks', sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True))
+    # Lets process_pending_checks find claimable rows without scanning the table
+    op.create_index(
+        'ix_background_checks_pending_claim',
+        'background_checks',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_background_checks_pending_claim', table_name='background_checks')
+    op.drop_column('background_checks', 'claimed_at')
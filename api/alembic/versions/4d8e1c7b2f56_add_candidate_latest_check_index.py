@@ -0,0 +1,32 @@
+"""Add (candidate_id, created_at, id) index on background_checks
+
+Revision ID: 4d8e1c7b2f56
+Revises: e2b7f4a9c031
+Create Date: 2025-10-10 14:37:08.915530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8e1c7b2f56'
+down_revision: Union[str, None] = 'e2b7f4a9c031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Finds each candidate's latest check for the summary listing
+    op.create_index(
+        'ix_background_checks_candidate_id_created_at_id',
+        'background_checks',
+        ['candidate_id', 'created_at', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_background_checks_candidate_id_created_at_id', table_name='background_checks')
@@ -0,0 +1,116 @@
+"""Range-partition check_results by created_at month
+
+Revision ID: 8f4c2d6a1e93
+Revises: 3b7e21c9d4a0
+Create Date: 2025-09-28 14:36:12.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4c2d6a1e93'
+down_revision: Union[str, None] = '3b7e21c9d4a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months of partitions to create ahead of the current one; the worker's
+# maintain_check_result_partitions task keeps this horizon topped up
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    # Move the existing table (and the names it owns) out of the way
+    op.rename_table('check_results', 'check_results_unpartitioned')
+    op.execute('ALTER TABLE check_results_unpartitioned RENAME CONSTRAINT check_results_pkey TO check_results_unpartitioned_pkey')
+    op.execute('ALTER INDEX ix_check_results_id RENAME TO ix_check_results_unpartitioned_id')
+
+    op.execute("""
+        CREATE TABLE check_results (
+            id INTEGER NOT NULL DEFAULT nextval('check_results_id_seq'),
+            background_check_id INTEGER NOT NULL REFERENCES background_checks (id),
+            check_type checktype NOT NULL,
+            status resultstatus,
+            result_data TEXT,
+            error_message TEXT,
+            started_at TIMESTAMP WITH TIME ZONE,
+            completed_at TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute('ALTER SEQUENCE check_results_id_seq OWNED BY check_results.id')
+    op.create_index(op.f('ix_check_results_id'), 'check_results', ['id'], unique=False)
+    op.create_index('ix_check_results_background_check_id', 'check_results', ['background_check_id'], unique=False)
+
+    # One partition per month from the oldest existing row to MONTHS_AHEAD
+    # months from now
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month_start date;
+        BEGIN
+            FOR month_start IN
+                SELECT generate_series(
+                    date_trunc('month', LEAST(
+                        COALESCE((SELECT min(created_at) FROM check_results_unpartitioned), now()),
+                        now()
+                    )),
+                    date_trunc('month', now()) + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE check_results_y%sm%s PARTITION OF check_results FOR VALUES FROM (%L) TO (%L)',
+                    to_char(month_start, 'YYYY'),
+                    to_char(month_start, 'MM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+            END LOOP;
+        END
+        $$
+    """)
+
+    op.execute("""
+        INSERT INTO check_results (
+            id, background_check_id, check_type, status, result_data, error_message,
+            started_at, completed_at, created_at, updated_at
+        )
+        SELECT
+            id, background_check_id, check_type, status, result_data, error_message,
+            started_at, completed_at, COALESCE(created_at, now()), updated_at
+        FROM check_results_unpartitioned
+    """)
+    op.drop_table('check_results_unpartitioned')
+
+
+def downgrade() -> None:
+    op.rename_table('check_results', 'check_results_partitioned')
+    op.execute('ALTER TABLE check_results_partitioned RENAME CONSTRAINT check_results_pkey TO check_results_partitioned_pkey')
+    op.execute('ALTER INDEX ix_check_results_id RENAME TO ix_check_results_partitioned_id')
+
+    op.create_table('check_results',
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('check_results_id_seq')"), nullable=False),
+        sa.Column('background_check_id', sa.Integer(), nullable=False),
+        sa.Column('check_type', postgresql.ENUM('CRIMINAL', 'EDUCATION', 'EMPLOYMENT', 'IDENTITY', 'SOCIAL_MEDIA', name='checktype', create_type=False), nullable=False),
+        sa.Column('status', postgresql.ENUM('PASS', 'FAIL', 'PENDING', 'ERROR', name='resultstatus', create_type=False), nullable=True),
+        sa.Column('result_data', sa.Text(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['background_check_id'], ['background_checks.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute('INSERT INTO check_results SELECT * FROM check_results_partitioned')
+    op.execute('ALTER SEQUENCE check_results_id_seq OWNED BY check_results.id')
+    op.create_index(op.f('ix_check_results_id'), 'check_results', ['id'], unique=False)
+    # Dropping the parent drops every partition with it
+    op.drop_table('check_results_partitioned')
@@ -0,0 +1,29 @@
+"""Add (created_at, id) indexes for keyset pagination
+
+Revision ID: e2b7f4a9c031
+Revises: c5a9e0f3b712
+Create Date: 2025-10-09 11:02:51.204377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7f4a9c031'
+down_revision: Union[str, None] = 'c5a9e0f3b712'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Scanned backwards for newest-first pages
+    op.create_index('ix_candidates_created_at_id', 'candidates', ['created_at', 'id'], unique=False)
+    op.create_index('ix_background_checks_created_at_id', 'background_checks', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_background_checks_created_at_id', table_name='background_checks')
+    op.drop_index('ix_candidates_created_at_id', table_name='candidates')
@@ -1,56 +1,185 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
 
-from app.core.database import get_db
-from app.schemas.background_check import BackgroundCheckCreate, BackgroundCheckResponse
-from app.services.background_check_service import BackgroundCheckService
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_async_db
+from app.core.pagination import NEXT_CURSOR_HEADER, InvalidCursor
+from app.core.redis_client import get_async_redis
+from app.models.organization import Organization
+from app.schemas.background_check import (
+    BackgroundCheckBatchCreate,
+    BackgroundCheckBatchResult,
+    BackgroundCheckCreate,
+    BackgroundCheckResponse,
+)
+from app.services.background_check_service import AsyncBackgroundCheckService, UnknownUser
+from app.services.export_service import BackgroundCheckExportService
+from app.services.progress_service import ProgressService
+from app.services.response_cache_service import check_response_cache, etag_for, etag_matches
 
 router = APIRouter()
 
 
 @router.post("/", response_model=BackgroundCheckResponse)
-def create_background_check(
+async def create_background_check(
     background_check: BackgroundCheckCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new background check"""
-    service = BackgroundCheckService(db)
-    return service.create_background_check(background_check)
+    service = AsyncBackgroundCheckService(db)
+    return await service.create_background_check(background_check)
+
+
+@router.post("/batch", response_model=BackgroundCheckBatchResult)
+async def create_background_check_batch(
+    batch: BackgroundCheckBatchCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create and start the same background check for many candidates
+
+    Candidates that do not exist are listed in ``missing_candidate_ids``;
+    checks are created and started for all the others.
+    """
+    if len(batch.candidate_ids) > settings.BACKGROUND_CHECK_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BACKGROUND_CHECK_BATCH_MAX_SIZE} candidates per batch",
+        )
+    service = AsyncBackgroundCheckService(db)
+    try:
+        return await service.create_and_start_batch(batch)
+    except UnknownUser:
+        raise HTTPException(status_code=404, detail="User not found")
 
 
 @router.get("/", response_model=List[BackgroundCheckResponse])
-def get_background_checks(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+async def get_background_checks(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all background checks"""
-    service = BackgroundCheckService(db)
-    return service.get_background_checks(skip=skip, limit=limit)
+    """Get background checks, newest first
+
+    While more remain, the response carries an ``X-Next-Cursor`` header;
+    pass it back as ``cursor`` to get the next page.
+    """
+    service = AsyncBackgroundCheckService(db)
+    try:
+        page = await service.get_background_checks(cursor=cursor, limit=limit)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+
+@router.get("/export")
+async def export_background_checks(
+    organization_id: int,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Export an organization's background checks with their results
+
+    Covers the checks created from ``created_from`` up to ``created_to``.
+    NDJSON has one object per check with its results nested; CSV has one
+    row per result. The export is streamed as it is read, gzipped on the
+    fly with ``gzip=true``.
+    """
+    if await db.get(Organization, organization_id) is None:
+        raise HTTPException(status_code=404, detail="Organization not found")
+
+    filename = f"background-checks-{organization_id}.{format}"
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    export = BackgroundCheckExportService(AsyncSessionLocal, yield_per=settings.EXPORT_YIELD_PER)
+    return StreamingResponse(
+        export.stream(format, organization_id, created_from, created_to, gzip=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{check_id}", response_model=BackgroundCheckResponse)
-def get_background_check(
+async def get_background_check(
     check_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get a specific background check"""
-    service = BackgroundCheckService(db)
-    background_check = service.get_background_check(check_id)
-    if not background_check:
+    """Get a specific background check
+
+    Responses carry an ETag that changes whenever the check or one of its
+    results does. A request whose ``If-None-Match`` holds the current ETag
+    gets a 304 without the database being read; otherwise the body comes
+    from the response cache, or is read and cached.
+    """
+    service = AsyncBackgroundCheckService(db)
+    cache = check_response_cache()
+    version = await cache.version(check_id)
+    if version is None:
+        background_check = await service.get_background_check(check_id)
+        if not background_check:
+            raise HTTPException(status_code=404, detail="Background check not found")
+        return background_check
+
+    etag = etag_for(check_id, version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    async def load() -> Optional[bytes]:
+        background_check = await service.get_background_check(check_id)
+        if not background_check:
+            return None
+        return BackgroundCheckResponse.model_validate(background_check).model_dump_json().encode()
+
+    body = await cache.get_or_load(check_id, version, load)
+    if body is None:
         raise HTTPException(status_code=404, detail="Background check not found")
-    return background_check
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @router.post("/{check_id}/start")
-def start_background_check(
+async def start_background_check(
     check_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Start a background check process"""
-    service = BackgroundCheckService(db)
-    success = service.start_background_check(check_id)
+    service = AsyncBackgroundCheckService(db)
+    success = await service.start_background_check(check_id)
     if not success:
         raise HTTPException(status_code=404, detail="Background check not found")
     return {"message": "Background check started successfully"}
+
+
+@router.get("/{check_id}/events")
+async def stream_background_check_events(check_id: int, request: Request):
+    """Stream a background check's progress as Server-Sent Events
+
+    Replaces polling ``GET /{check_id}``: the database is read once for the
+    opening snapshot, and every later update comes from the workers' events.
+    """
+    async def load_snapshot() -> Optional[Dict[str, Any]]:
+        # A short-lived session, so no connection is held while the stream is open
+        async with AsyncSessionLocal() as db:
+            return await AsyncBackgroundCheckService(db).get_progress_snapshot(check_id)
+
+    if await load_snapshot() is None:
+        raise HTTPException(status_code=404, detail="Background check not found")
+
+    progress = ProgressService(get_async_redis(), keepalive_seconds=settings.SSE_KEEPALIVE_SECONDS)
+    return StreamingResponse(
+        progress.stream(check_id, load_snapshot, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
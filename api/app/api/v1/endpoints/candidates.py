@@ -1,70 +1,142 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
 
-from app.core.database import get_db
-from app.schemas.candidate import CandidateCreate, CandidateUpdate, CandidateResponse
-from app.services.candidate_service import CandidateService
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.pagination import NEXT_CURSOR_HEADER, InvalidCursor
+from app.schemas.candidate import CandidateCreate, CandidateImportResult, CandidateUpdate, CandidateResponse
+from app.services.candidate_import_service import (
+    CandidateImportService,
+    ImportFormatError,
+    ImportTargetNotFound,
+    import_format,
+)
+from app.services.candidate_service import SUMMARY_FIELDS, AsyncCandidateService, UnknownFields
 
 router = APIRouter()
 
 
 @router.post("/", response_model=CandidateResponse)
-def create_candidate(
+async def create_candidate(
     candidate: CandidateCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new candidate"""
-    service = CandidateService(db)
-    return service.create_candidate(candidate)
+    service = AsyncCandidateService(db)
+    return await service.create_candidate(candidate)
+
+
+@router.post("/import", response_model=CandidateImportResult)
+async def import_candidates(
+    request: Request,
+    organization_id: int,
+    created_by_user_id: int,
+    format: Optional[Literal["csv", "ndjson"]] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Import candidates in bulk from a streamed CSV or NDJSON body
+
+    The format comes from ``format`` or else the Content-Type (``text/csv``
+    or ``application/x-ndjson``). A CSV upload starts with a header row
+    naming its columns. Candidates are matched on email: new ones are
+    created for the organization and existing ones updated. Rows that cannot
+    be imported are listed in the response by line number; they do not stop
+    the others.
+    """
+    fmt = format or import_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Upload CSV (text/csv) or NDJSON (application/x-ndjson)")
+
+    service = CandidateImportService(
+        db, chunk_size=settings.IMPORT_CHUNK_SIZE, max_reported_errors=settings.IMPORT_MAX_REPORTED_ERRORS
+    )
+    try:
+        return await service.import_candidates(request.stream(), fmt, organization_id, created_by_user_id)
+    except ImportTargetNotFound as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
 @router.get("/", response_model=List[CandidateResponse])
-def get_candidates(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+async def get_candidates(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    view: Literal["summary", "full"] = "full",
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,last_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all candidates"""
-    service = CandidateService(db)
-    return service.get_candidates(skip=skip, limit=limit)
+    """Get candidates, newest first
+
+    While more remain, the response carries an ``X-Next-Cursor`` header;
+    pass it back as ``cursor`` to get the next page.
+
+    ``view=full`` returns each candidate with all their background checks
+    and results. ``view=summary`` returns just the id, name and status of
+    the latest check, and ``fields`` picks any other set of the candidate's
+    own fields. Those are read straight from the columns and returned as is,
+    without building the nested response.
+    """
+    service = AsyncCandidateService(db)
+    projected = view == "summary" or fields is not None
+    try:
+        if projected:
+            selected = [name.strip() for name in fields.split(",") if name.strip()] if fields else SUMMARY_FIELDS
+            page = await service.get_candidate_fields(selected, cursor=cursor, limit=limit)
+        else:
+            page = await service.get_candidates(cursor=cursor, limit=limit)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except UnknownFields as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    if projected:
+        # Plain column values, returned without validating them against CandidateResponse
+        return JSONResponse(jsonable_encoder(page.items), headers=headers)
+    response.headers.update(headers)
+    return page.items
 
 
 @router.get("/{candidate_id}", response_model=CandidateResponse)
-def get_candidate(
+async def get_candidate(
     candidate_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific candidate"""
-    service = CandidateService(db)
-    candidate = service.get_candidate(candidate_id)
+    service = AsyncCandidateService(db)
+    candidate = await service.get_candidate(candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     return candidate
 
 
 @router.put("/{candidate_id}", response_model=CandidateResponse)
-def update_candidate(
+async def update_candidate(
     candidate_id: int,
     candidate_update: CandidateUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a candidate"""
-    service = CandidateService(db)
-    candidate = service.update_candidate(candidate_id, candidate_update)
+    service = AsyncCandidateService(db)
+    candidate = await service.update_candidate(candidate_id, candidate_update)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     return candidate
 
 
 @router.delete("/{candidate_id}")
-def delete_candidate(
+async def delete_candidate(
     candidate_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a candidate"""
-    service = CandidateService(db)
-    success = service.delete_candidate(candidate_id)
+    service = AsyncCandidateService(db)
+    success = await service.delete_candidate(candidate_id)
     if not success:
         raise HTTPException(status_code=404, detail="Candidate not found")
     return {"message": "Candidate deleted successfully"}
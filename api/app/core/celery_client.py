@@ -0,0 +1,19 @@
+from typing import Optional
+
+from celery import Celery
+from app.core.config import settings
+
+# Producer-only client: the API sends tasks to the worker by name and never
+# imports worker code
+celery_client = Celery("background_check_api", broker=settings.REDIS_URL)
+
+# Queue the worker consumes for each plan tier (see worker/scheduling.py)
+PLAN_QUEUES = {
+    "enterprise": "checks.enterprise",
+    "premium": "checks.premium",
+    "basic": "checks.basic",
+}
+
+
+def queue_for_plan(plan_type: Optional[str]) -> str:
+    return PLAN_QUEUES.get(plan_type, PLAN_QUEUES["basic"])
@@ -0,0 +1,61 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import Select, tuple_
+
+T = TypeVar("T")
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    """A cursor token that this API did not issue"""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque token for the position just after the row ``(created_at, row_id)``"""
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise InvalidCursor(token) from exc
+
+
+def keyset_page(stmt: Select, model, cursor: Optional[str], limit: int) -> Select:
+    """Restrict ``stmt`` to one page of ``model`` rows, newest first
+
+    Rows are ordered on ``(created_at, id)`` and the page starts strictly
+    after the cursor's row, so the database seeks straight to it on the
+    matching index instead of reading and discarding every earlier row as
+    OFFSET does. One row more than ``limit`` is fetched to tell whether
+    another page follows.
+    """
+    if cursor:
+        stmt = stmt.where(tuple_(model.created_at, model.id) < decode_cursor(cursor))
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def page_of(rows: List[T], limit: int) -> Page[T]:
+    """The page of rows fetched with ``keyset_page``"""
+    items = rows[:limit]
+    if len(rows) <= limit:
+        return Page(items)
+    last = items[-1]
+    return Page(items, encode_cursor(last.created_at, last.id))
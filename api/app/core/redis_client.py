@@ -0,0 +1,25 @@
+from typing import Optional
+
+import redis as redis_sync
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+_redis: Optional[redis.Redis] = None
+_sync_redis: Optional[redis_sync.Redis] = None
+
+
+def get_async_redis() -> redis.Redis:
+    """Shared asyncio Redis client, created on first use"""
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis
+
+
+def get_redis() -> redis_sync.Redis:
+    """Shared blocking Redis client for the synchronous services, created on first use"""
+    global _sync_redis
+    if _sync_redis is None:
+        _sync_redis = redis_sync.Redis.from_url(settings.REDIS_URL)
+    return _sync_redis
@@ -4,6 +4,7 @@ from .check_result import CheckResult, CheckType, ResultStatus
 from .user import User, UserRole, UserStatus
 from .organization import Organization
 from .report import Report, ReportStatus, ReportType
+from .outbox_event import OutboxEvent
 
 __all__ = [
     "Candidate", 
@@ -12,6 +13,7 @@ __all__ = [
     "User", 
     "Organization", 
     "Report",
+    "OutboxEvent",
     "CheckStatus",
     "CheckType", 
     "ResultStatus",
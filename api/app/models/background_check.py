@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -15,6 +15,12 @@ class CheckStatus(str, enum.Enum):
 
 class BackgroundCheck(Base):
     __tablename__ = "background_checks"
+    __table_args__ = (
+        # Keyset pagination order (see app/core/pagination.py)
+        Index("ix_background_checks_created_at_id", "created_at", "id"),
+        # A candidate's latest check, for the summary view of the candidate listing
+        Index("ix_background_checks_candidate_id_created_at_id", "candidate_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
@@ -28,6 +34,9 @@ class BackgroundCheck(Base):
     identity_verification = Column(Boolean, default=False)
     social_media_check = Column(Boolean, default=False)
     
+    # Dispatch lease: set when process_pending_checks claims the check
+    claimed_at = Column(DateTime(timezone=True))
+
     # Timestamps
     started_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
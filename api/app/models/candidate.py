@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -6,6 +6,8 @@ from app.core.database import Base
 
 class Candidate(Base):
     __tablename__ = "candidates"
+    # Keyset pagination order (see app/core/pagination.py)
+    __table_args__ = (Index("ix_candidates_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
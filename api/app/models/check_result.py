@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Enum
+from sqlalchemy import DDL, Column, Integer, String, DateTime, Text, ForeignKey, Enum, Sequence, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -22,8 +22,12 @@ class ResultStatus(str, enum.Enum):
 
 class CheckResult(Base):
     __tablename__ = "check_results"
+    # Range-partitioned by month; partitions are managed by the worker
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
-    id = Column(Integer, primary_key=True, index=True)
+    # The partition key has to be part of the primary key, so id is fed
+    # from its sequence explicitly rather than being a SERIAL primary key
+    id = Column(Integer, Sequence("check_results_id_seq"), primary_key=True, index=True)
     background_check_id = Column(Integer, ForeignKey("background_checks.id"), nullable=False)
     check_type = Column(Enum(CheckType), nullable=False)
     status = Column(Enum(ResultStatus), default=ResultStatus.PENDING)
@@ -33,8 +37,41 @@ class CheckResult(Base):
     # Timestamps
     started_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     background_check = relationship("BackgroundCheck", back_populates="check_results")
+
+
+# A check_results created by metadata.create_all (rather than the migrations)
+# would have no partitions, and every insert would fail until the worker's
+# nightly maintenance ran. Create this month's partition and the next three,
+# as the migration does; the worker keeps the horizon topped up from there.
+event.listen(
+    CheckResult.__table__,
+    "after_create",
+    DDL("""
+        DO $$
+        DECLARE
+            month_start date;
+        BEGIN
+            FOR month_start IN
+                SELECT generate_series(
+                    date_trunc('month', now()),
+                    date_trunc('month', now()) + interval '3 months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS check_results_y%%sm%%s PARTITION OF check_results FOR VALUES FROM (%%L) TO (%%L)',
+                    to_char(month_start, 'YYYY'),
+                    to_char(month_start, 'MM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+            END LOOP;
+        END
+        $$
+    """).execute_if(dialect="postgresql"),
+)
@@ -1,12 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List
 from app.models.background_check import CheckStatus
 from app.schemas.check_result import CheckResultResponse
 
 
-class BackgroundCheckCreate(BaseModel):
-    candidate_id: int
+class BackgroundCheckPackage(BaseModel):
     criminal_check: bool = False
     education_verification: bool = False
     employment_verification: bool = False
@@ -14,6 +13,25 @@ class BackgroundCheckCreate(BaseModel):
     social_media_check: bool = False
 
 
+class BackgroundCheckCreate(BackgroundCheckPackage):
+    candidate_id: int
+
+
+class BackgroundCheckBatchCreate(BackgroundCheckPackage):
+    candidate_ids: List[int] = Field(..., min_length=1)
+    created_by_user_id: int
+
+
+class BackgroundCheckBatchItem(BaseModel):
+    candidate_id: int
+    check_id: int
+
+
+class BackgroundCheckBatchResult(BaseModel):
+    created: List[BackgroundCheckBatchItem]
+    missing_candidate_ids: List[int] = []
+
+
 class BackgroundCheckResponse(BaseModel):
     id: int
     candidate_id: int
@@ -39,3 +39,21 @@ class CandidateResponse(CandidateBase):
 
     class Config:
         from_attributes = True
+
+
+class CandidateImportRow(CandidateBase):
+    consent_given: bool = False
+
+
+class CandidateImportError(BaseModel):
+    line: int
+    errors: List[str]
+
+
+class CandidateImportResult(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    failed: int
+    # The first IMPORT_MAX_REPORTED_ERRORS failed rows
+    errors: List[CandidateImportError] = []
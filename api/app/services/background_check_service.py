@@ -1,10 +1,51 @@
+from sqlalchemy import cast, column, func, insert, literal, select, true, values
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 
+from app.core.celery_client import queue_for_plan
+from app.core.pagination import Page, keyset_page, page_of
 from app.models.background_check import BackgroundCheck, CheckStatus
+from app.models.candidate import Candidate
 from app.models.check_result import CheckResult, CheckType, ResultStatus
-from app.schemas.background_check import BackgroundCheckCreate
+from app.models.user import User
+from app.schemas.background_check import (
+    BackgroundCheckBatchCreate,
+    BackgroundCheckBatchItem,
+    BackgroundCheckBatchResult,
+    BackgroundCheckCreate,
+    BackgroundCheckPackage,
+)
+from app.services import loaders
+from app.services.outbox_service import AsyncOutboxService, OutboxService
+from app.services.response_cache_service import bump_check_version, check_response_cache
+
+
+def enabled_check_types(background_check: Union[BackgroundCheck, BackgroundCheckPackage]) -> List[CheckType]:
+    check_types = []
+    if background_check.criminal_check:
+        check_types.append(CheckType.CRIMINAL)
+    if background_check.education_verification:
+        check_types.append(CheckType.EDUCATION)
+    if background_check.employment_verification:
+        check_types.append(CheckType.EMPLOYMENT)
+    if background_check.identity_verification:
+        check_types.append(CheckType.IDENTITY)
+    if background_check.social_media_check:
+        check_types.append(CheckType.SOCIAL_MEDIA)
+    return check_types
+
+
+def progress_snapshot(background_check: BackgroundCheck) -> Dict[str, Any]:
+    results = sorted(background_check.check_results, key=lambda result: result.id)
+    return {
+        "check_id": background_check.id,
+        "status": background_check.status.value,
+        "started_at": background_check.started_at,
+        "completed_at": background_check.completed_at,
+        "check_results": {result.check_type.value: result.status.value for result in results},
+    }
 
 
 class BackgroundCheckService:
@@ -26,34 +67,46 @@ class BackgroundCheckService:
         return db_background_check
 
     def get_background_check(self, check_id: int) -> Optional[BackgroundCheck]:
-        return self.db.query(BackgroundCheck).filter(BackgroundCheck.id == check_id).first()
+        return (
+            self.db.query(BackgroundCheck)
+            .options(*loaders.BACKGROUND_CHECK_RESPONSE)
+            .filter(BackgroundCheck.id == check_id)
+            .first()
+        )
 
-    def get_background_checks(self, skip: int = 0, limit: int = 100) -> List[BackgroundCheck]:
-        return self.db.query(BackgroundCheck).offset(skip).limit(limit).all()
+    def get_progress_snapshot(self, check_id: int) -> Optional[Dict[str, Any]]:
+        """Current status of a check and of each of its sub-checks"""
+        db_background_check = self.get_background_check(check_id)
+        if not db_background_check:
+            return None
+        return progress_snapshot(db_background_check)
+
+    def get_background_checks(self, cursor: Optional[str] = None, limit: int = 100) -> Page[BackgroundCheck]:
+        stmt = keyset_page(
+            select(BackgroundCheck).options(*loaders.BACKGROUND_CHECK_RESPONSE), BackgroundCheck, cursor, limit
+        )
+        return page_of(list(self.db.scalars(stmt).all()), limit)
 
     def start_background_check(self, check_id: int) -> bool:
+        """Queue a background check for processing
+
+        The check stays PENDING until a worker claims it and moves it to
+        IN_PROGRESS. The task that processes it is written to the outbox in
+        the same transaction and published as soon as that commits, so work
+        starts right away and is never lost if the broker is unreachable.
+        """
         db_background_check = self.get_background_check(check_id)
         if not db_background_check:
             return False
+        if db_background_check.status != CheckStatus.PENDING or db_background_check.claimed_at is not None:
+            # Already started
+            return True
 
-        # Update status to in progress
-        db_background_check.status = CheckStatus.IN_PROGRESS
-        db_background_check.started_at = datetime.utcnow()
+        # Take the dispatch lease, so process_pending_checks leaves it to the outbox
+        db_background_check.claimed_at = datetime.utcnow()
 
         # Create check result entries for each enabled check type
-        check_types = []
-        if db_background_check.criminal_check:
-            check_types.append(CheckType.CRIMINAL)
-        if db_background_check.education_verification:
-            check_types.append(CheckType.EDUCATION)
-        if db_background_check.employment_verification:
-            check_types.append(CheckType.EMPLOYMENT)
-        if db_background_check.identity_verification:
-            check_types.append(CheckType.IDENTITY)
-        if db_background_check.social_media_check:
-            check_types.append(CheckType.SOCIAL_MEDIA)
-
-        for check_type in check_types:
+        for check_type in enabled_check_types(db_background_check):
             check_result = CheckResult(
                 background_check_id=check_id,
                 check_type=check_type,
@@ -62,5 +115,169 @@ class BackgroundCheckService:
             )
             self.db.add(check_result)
 
+        organization = db_background_check.candidate.organization
+        outbox = OutboxService(self.db)
+        event = outbox.add_task(
+            "worker.tasks.process_background_check",
+            args=[check_id],
+            queue=queue_for_plan(organization.plan_type if organization else None),
+        )
+
         self.db.commit()
+        bump_check_version(check_id)
+        outbox.publish([event])
         return True
+
+
+class UnknownUser(LookupError):
+    """A batch of checks was requested on behalf of a user that does not exist"""
+
+
+class AsyncBackgroundCheckService:
+    """``BackgroundCheckService`` on an ``AsyncSession``"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_background_check(self, background_check: BackgroundCheckCreate) -> BackgroundCheck:
+        db_background_check = BackgroundCheck(
+            candidate_id=background_check.candidate_id,
+            criminal_check=background_check.criminal_check,
+            education_verification=background_check.education_verification,
+            employment_verification=background_check.employment_verification,
+            identity_verification=background_check.identity_verification,
+            social_media_check=background_check.social_media_check
+        )
+        self.db.add(db_background_check)
+        await self.db.commit()
+        return await self.get_background_check(db_background_check.id)
+
+    async def get_background_check(self, check_id: int) -> Optional[BackgroundCheck]:
+        return await self.db.scalar(
+            select(BackgroundCheck)
+            .where(BackgroundCheck.id == check_id)
+            .options(*loaders.BACKGROUND_CHECK_RESPONSE)
+            .execution_options(populate_existing=True)
+        )
+
+    async def get_progress_snapshot(self, check_id: int) -> Optional[Dict[str, Any]]:
+        """Current status of a check and of each of its sub-checks"""
+        db_background_check = await self.get_background_check(check_id)
+        if not db_background_check:
+            return None
+        return progress_snapshot(db_background_check)
+
+    async def get_background_checks(self, cursor: Optional[str] = None, limit: int = 100) -> Page[BackgroundCheck]:
+        result = await self.db.scalars(
+            keyset_page(select(BackgroundCheck).options(*loaders.BACKGROUND_CHECK_RESPONSE), BackgroundCheck, cursor, limit)
+        )
+        return page_of(list(result.all()), limit)
+
+    async def start_background_check(self, check_id: int) -> bool:
+        """Queue a background check for processing (see ``BackgroundCheckService``)"""
+        db_background_check = await self.db.scalar(
+            select(BackgroundCheck)
+            .where(BackgroundCheck.id == check_id)
+            .options(*loaders.BACKGROUND_CHECK_DISPATCH)
+        )
+        if not db_background_check:
+            return False
+        if db_background_check.status != CheckStatus.PENDING or db_background_check.claimed_at is not None:
+            # Already started
+            return True
+
+        # Take the dispatch lease, so process_pending_checks leaves it to the outbox
+        db_background_check.claimed_at = datetime.utcnow()
+
+        # Create check result entries for each enabled check type
+        for check_type in enabled_check_types(db_background_check):
+            self.db.add(CheckResult(
+                background_check_id=check_id,
+                check_type=check_type,
+                status=ResultStatus.PENDING,
+                started_at=datetime.utcnow()
+            ))
+
+        organization = db_background_check.candidate.organization
+        outbox = AsyncOutboxService(self.db)
+        event = outbox.add_task(
+            "worker.tasks.process_background_check",
+            args=[check_id],
+            queue=queue_for_plan(organization.plan_type if organization else None),
+        )
+
+        await self.db.commit()
+        await check_response_cache().bump(check_id)
+        await outbox.publish([event])
+        return True
+
+    async def create_and_start_batch(self, batch: BackgroundCheckBatchCreate) -> BackgroundCheckBatchResult:
+        """Create and start the same package of checks for many candidates at once
+
+        The checks are created in one ``INSERT ... SELECT`` over the
+        candidates that exist and their pending results in a second one,
+        whatever the size of the batch. Instead of a task per check, one
+        outbox event runs ``process_pending_checks``, which claims the new
+        checks in batches and spreads them fairly across organizations, so a
+        large submission cannot hold up other tenants' checks.
+        """
+        if await self.db.get(User, batch.created_by_user_id) is None:
+            raise UnknownUser(batch.created_by_user_id)
+        candidate_ids = list(dict.fromkeys(batch.candidate_ids))
+        package = batch.model_dump(include=set(BackgroundCheckPackage.model_fields))
+
+        created = (
+            await self.db.execute(
+                insert(BackgroundCheck)
+                .from_select(
+                    ["candidate_id", "created_by_user_id", "status", *package],
+                    select(
+                        Candidate.id,
+                        literal(batch.created_by_user_id),
+                        cast(literal(CheckStatus.PENDING.name), BackgroundCheck.status.type),
+                        *(literal(enabled) for enabled in package.values()),
+                    )
+                    .where(Candidate.id.in_(candidate_ids))
+                    .order_by(Candidate.id),
+                )
+                .returning(BackgroundCheck.candidate_id, BackgroundCheck.id)
+            )
+        ).all()
+        check_ids = {candidate_id: check_id for candidate_id, check_id in created}
+
+        check_types = enabled_check_types(batch)
+        if check_ids and check_types:
+            types = values(column("check_type", CheckResult.check_type.type), name="types").data(
+                [(check_type,) for check_type in check_types]
+            )
+            await self.db.execute(
+                insert(CheckResult).from_select(
+                    ["id", "background_check_id", "check_type", "status", "started_at"],
+                    select(
+                        CheckResult.__table__.c.id.default.next_value(),
+                        BackgroundCheck.id,
+                        cast(types.c.check_type, CheckResult.check_type.type),
+                        cast(literal(ResultStatus.PENDING.name), CheckResult.status.type),
+                        func.now(),
+                    )
+                    .select_from(BackgroundCheck)
+                    .join(types, true())
+                    .where(BackgroundCheck.id.in_(list(check_ids.values()))),
+                )
+            )
+
+        events = []
+        outbox = AsyncOutboxService(self.db)
+        if check_ids:
+            events.append(outbox.add_task("worker.tasks.process_pending_checks"))
+        await self.db.commit()
+        await outbox.publish(events)
+
+        return BackgroundCheckBatchResult(
+            created=[
+                BackgroundCheckBatchItem(candidate_id=candidate_id, check_id=check_ids[candidate_id])
+                for candidate_id in candidate_ids
+                if candidate_id in check_ids
+            ],
+            missing_candidate_ids=[candidate_id for candidate_id in candidate_ids if candidate_id not in check_ids],
+        )
@@ -0,0 +1,285 @@
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.organization import Organization
+from app.models.user import User
+from app.schemas.candidate import CandidateImportError, CandidateImportResult, CandidateImportRow
+
+# Content types each import format is accepted under
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+REQUIRED_CSV_COLUMNS = ("email", "first_name", "last_name")
+
+# Column order of the staging table and of each COPY row
+STAGED_COLUMNS = (
+    "line", "email", "first_name", "last_name", "phone", "date_of_birth", "address", "consent_given",
+)
+
+CREATE_STAGING_TABLE = """
+CREATE TEMP TABLE candidate_import (
+    line integer NOT NULL,
+    email text NOT NULL,
+    first_name text NOT NULL,
+    last_name text NOT NULL,
+    phone text,
+    date_of_birth timestamp,
+    address text,
+    consent_given boolean NOT NULL
+) ON COMMIT DROP
+"""
+
+# Rows whose email belongs to a candidate of another organization
+FOREIGN_EMAILS = """
+SELECT i.line
+FROM candidate_import i
+JOIN candidates c ON c.email = i.email
+WHERE c.organization_id <> :organization_id
+"""
+
+# Rows superseded by a later row with the same email
+SUPERSEDED_ROWS = """
+SELECT line, latest
+FROM (
+    SELECT line, max(line) OVER (PARTITION BY email) AS latest
+    FROM candidate_import
+) rows
+WHERE line < latest
+"""
+
+# Upsert the last row of each email; an import never clears a field it leaves
+# empty, and never touches another organization's candidate
+MERGE_CANDIDATES = """
+WITH merged AS (
+    INSERT INTO candidates (
+        email, first_name, last_name, phone, date_of_birth, address,
+        consent_given, consent_date, organization_id, created_by_user_id
+    )
+    SELECT DISTINCT ON (email)
+        email, first_name, last_name, phone, date_of_birth, address,
+        consent_given, CASE WHEN consent_given THEN now() END, :organization_id, :created_by_user_id
+    FROM candidate_import
+    ORDER BY email, line DESC
+    ON CONFLICT (email) DO UPDATE SET
+        first_name = EXCLUDED.first_name,
+        last_name = EXCLUDED.last_name,
+        phone = coalesce(EXCLUDED.phone, candidates.phone),
+        date_of_birth = coalesce(EXCLUDED.date_of_birth, candidates.date_of_birth),
+        address = coalesce(EXCLUDED.address, candidates.address),
+        consent_given = EXCLUDED.consent_given,
+        consent_date = CASE
+            WHEN EXCLUDED.consent_given AND NOT coalesce(candidates.consent_given, false) THEN now()
+            ELSE candidates.consent_date
+        END,
+        updated_at = now()
+    WHERE candidates.organization_id = EXCLUDED.organization_id
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM merged
+"""
+
+Record = Tuple[int, Union[Dict[str, Any], str]]
+
+
+class ImportFormatError(ValueError):
+    """The upload as a whole cannot be read in the requested format"""
+
+
+class ImportTargetNotFound(LookupError):
+    """The organization or user an import is made for does not exist"""
+
+
+def import_format(content_type: Optional[str]) -> Optional[str]:
+    """The import format a Content-Type header names, if any"""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return IMPORT_FORMATS.get(media_type)
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decoded lines of a UTF-8 byte stream, line endings other than ``\\n`` kept"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    try:
+        async for chunk in chunks:
+            buffer += decoder.decode(chunk)
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                yield line
+        buffer += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise ImportFormatError(f"Upload is not valid UTF-8: {exc}") from exc
+    if buffer:
+        yield buffer
+
+
+async def _csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    """``(line, row)`` for each CSV record, or ``(line, error)`` if it is malformed
+
+    A quoted field may span lines, so lines are gathered until their quotes
+    balance before being parsed as one record.
+    """
+    header: Optional[List[str]] = None
+    record: List[str] = []
+    line_no = start = 0
+    async for line in lines:
+        line_no += 1
+        if not record:
+            start = line_no
+        record.append(line)
+        raw = "\n".join(record)
+        if raw.count('"') % 2:
+            continue
+        record = []
+        if not raw.strip():
+            continue
+
+        try:
+            values = next(csv.reader([raw]))
+        except csv.Error as exc:
+            yield start, f"Malformed CSV: {exc}"
+            continue
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            missing = [name for name in REQUIRED_CSV_COLUMNS if name not in header]
+            if missing:
+                raise ImportFormatError(f"CSV header is missing columns: {', '.join(missing)}")
+            continue
+        if len(values) != len(header):
+            yield start, f"Expected {len(header)} fields, got {len(values)}"
+            continue
+        # Empty cells are missing values, so optional fields fall back to their defaults
+        yield start, {name: value for name, value in zip(header, values) if value != ""}
+
+    if record:
+        yield start, "Unterminated quoted field"
+    if header is None:
+        raise ImportFormatError("CSV upload has no header row")
+
+
+async def _ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_no, f"Malformed JSON: {exc}"
+            continue
+        if not isinstance(row, dict):
+            yield line_no, "Expected a JSON object"
+            continue
+        yield line_no, row
+
+
+def _validation_errors(exc: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()]
+
+
+class CandidateImportService:
+    """Bulk candidate import from a streamed CSV or NDJSON upload
+
+    Rows are validated ``chunk_size`` at a time as the upload arrives and
+    the valid ones are streamed into a temporary staging table with COPY.
+    Once the upload ends they are merged into ``candidates`` in one
+    statement: new emails are inserted and known ones updated, the last row
+    winning when an email repeats. Rows that fail validation, that repeat an
+    email, or whose email belongs to another organization's candidate are
+    reported by line number and skipped; the rest of the import goes ahead.
+    """
+
+    def __init__(self, db: AsyncSession, chunk_size: int = 1000, max_reported_errors: int = 1000):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.max_reported_errors = max_reported_errors
+
+    async def import_candidates(
+        self,
+        chunks: AsyncIterator[bytes],
+        fmt: str,
+        organization_id: int,
+        created_by_user_id: int,
+    ) -> CandidateImportResult:
+        if await self.db.get(Organization, organization_id) is None:
+            raise ImportTargetNotFound("Organization not found")
+        if await self.db.get(User, created_by_user_id) is None:
+            raise ImportTargetNotFound("User not found")
+
+        parse = _csv_records if fmt == "csv" else _ndjson_records
+        errors: Dict[int, List[str]] = {}
+
+        await self.db.execute(text(CREATE_STAGING_TABLE))
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        received = 0
+        async with raw.driver_connection.cursor() as cursor:
+            copy_sql = f"COPY candidate_import ({', '.join(STAGED_COLUMNS)}) FROM STDIN"
+            async with cursor.copy(copy_sql) as copy:
+                chunk: List[Record] = []
+                async for record in parse(_lines(chunks)):
+                    received += 1
+                    chunk.append(record)
+                    if len(chunk) >= self.chunk_size:
+                        for row in self._validate(chunk, errors):
+                            await copy.write_row(row)
+                        chunk = []
+                for row in self._validate(chunk, errors):
+                    await copy.write_row(row)
+
+        params = {"organization_id": organization_id}
+        for (line,) in await self.db.execute(text(FOREIGN_EMAILS), params):
+            errors.setdefault(line, []).append("email belongs to a candidate of another organization")
+        for line, latest in await self.db.execute(text(SUPERSEDED_ROWS)):
+            errors.setdefault(line, []).append(f"email repeated on line {latest}, which was imported instead")
+        inserted, updated = (
+            await self.db.execute(
+                text(MERGE_CANDIDATES),
+                {"organization_id": organization_id, "created_by_user_id": created_by_user_id},
+            )
+        ).one()
+        await self.db.commit()
+
+        reported = sorted(errors.items())[: self.max_reported_errors]
+        return CandidateImportResult(
+            received=received,
+            inserted=inserted,
+            updated=updated,
+            failed=len(errors),
+            errors=[CandidateImportError(line=line, errors=messages) for line, messages in reported],
+        )
+
+    @staticmethod
+    def _validate(chunk: List[Record], errors: Dict[int, List[str]]) -> List[Tuple[Any, ...]]:
+        """COPY rows for the valid records of ``chunk``; the rest go to ``errors``"""
+        rows = []
+        for line, record in chunk:
+            if isinstance(record, str):
+                errors[line] = [record]
+                continue
+            try:
+                candidate = CandidateImportRow.model_validate(record)
+            except ValidationError as exc:
+                errors[line] = _validation_errors(exc)
+                continue
+            rows.append((
+                line,
+                candidate.email,
+                candidate.first_name,
+                candidate.last_name,
+                candidate.phone,
+                candidate.date_of_birth,
+                candidate.address,
+                candidate.consent_given,
+            ))
+        return rows
@@ -1,9 +1,57 @@
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, Optional, Sequence
 from datetime import datetime
 
+from app.core.pagination import Page, keyset_page, page_of
+from app.models.background_check import BackgroundCheck
 from app.models.candidate import Candidate
-from app.schemas.candidate import CandidateCreate, CandidateUpdate
+from app.schemas.candidate import CandidateCreate, CandidateResponse, CandidateUpdate
+from app.services import loaders
+
+# Fields of the summary view of the candidate listing
+SUMMARY_FIELDS = ("id", "first_name", "last_name", "latest_check_status")
+
+# Every field a sparse fieldset may ask for, as the column that holds it:
+# the scalar fields of CandidateResponse, and the status of the latest check
+PROJECTIONS = {
+    **{
+        name: getattr(Candidate, name)
+        for name in CandidateResponse.model_fields
+        if name != "background_checks"
+    },
+    "latest_check_status": (
+        select(BackgroundCheck.status)
+        .where(BackgroundCheck.candidate_id == Candidate.id)
+        .order_by(BackgroundCheck.created_at.desc(), BackgroundCheck.id.desc())
+        .limit(1)
+        .scalar_subquery()
+        .label("latest_check_status")
+    ),
+}
+
+
+class UnknownFields(ValueError):
+    """A sparse fieldset named fields that cannot be projected"""
+
+    def __init__(self, fields: Sequence[str]):
+        super().__init__(f"Unknown fields: {', '.join(fields)}")
+        self.fields = fields
+
+
+def projection(fields: Sequence[str]) -> Select:
+    """Select only the columns behind ``fields``, plus the pagination keys"""
+    unknown = [name for name in fields if name not in PROJECTIONS]
+    if unknown:
+        raise UnknownFields(unknown)
+    names = dict.fromkeys([*fields, "id", "created_at"])
+    return select(*(PROJECTIONS[name] for name in names))
+
+
+def projected_page(rows, fields: Sequence[str], limit: int) -> Page[Dict[str, Any]]:
+    page = page_of(rows, limit)
+    return Page([{name: row._mapping[name] for name in fields} for row in page.items], page.next_cursor)
 
 
 class CandidateService:
@@ -27,10 +75,23 @@ class CandidateService:
         return db_candidate
 
     def get_candidate(self, candidate_id: int) -> Optional[Candidate]:
-        return self.db.query(Candidate).filter(Candidate.id == candidate_id).first()
+        return (
+            self.db.query(Candidate)
+            .options(*loaders.CANDIDATE_RESPONSE)
+            .filter(Candidate.id == candidate_id)
+            .first()
+        )
+
+    def get_candidates(self, cursor: Optional[str] = None, limit: int = 100) -> Page[Candidate]:
+        stmt = keyset_page(select(Candidate).options(*loaders.CANDIDATE_RESPONSE), Candidate, cursor, limit)
+        return page_of(list(self.db.scalars(stmt).all()), limit)
 
-    def get_candidates(self, skip: int = 0, limit: int = 100) -> List[Candidate]:
-        return self.db.query(Candidate).offset(skip).limit(limit).all()
+    def get_candidate_fields(
+        self, fields: Sequence[str] = SUMMARY_FIELDS, cursor: Optional[str] = None, limit: int = 100
+    ) -> Page[Dict[str, Any]]:
+        """A page of candidates with only ``fields``, loaded as plain columns"""
+        stmt = keyset_page(projection(fields), Candidate, cursor, limit)
+        return projected_page(self.db.execute(stmt).all(), fields, limit)
 
     def update_candidate(self, candidate_id: int, candidate_update: CandidateUpdate) -> Optional[Candidate]:
         db_candidate = self.get_candidate(candidate_id)
@@ -56,3 +117,71 @@ class CandidateService:
         self.db.delete(db_candidate)
         self.db.commit()
         return True
+
+
+class AsyncCandidateService:
+    """``CandidateService`` on an ``AsyncSession``"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _select():
+        return select(Candidate).options(*loaders.CANDIDATE_RESPONSE)
+
+    async def create_candidate(self, candidate: CandidateCreate) -> Candidate:
+        db_candidate = Candidate(
+            email=candidate.email,
+            first_name=candidate.first_name,
+            last_name=candidate.last_name,
+            phone=candidate.phone,
+            date_of_birth=candidate.date_of_birth,
+            address=candidate.address,
+            consent_given=candidate.consent_given,
+            consent_date=datetime.utcnow() if candidate.consent_given else None
+        )
+        self.db.add(db_candidate)
+        await self.db.commit()
+        return await self.get_candidate(db_candidate.id)
+
+    async def get_candidate(self, candidate_id: int) -> Optional[Candidate]:
+        return await self.db.scalar(
+            self._select()
+            .where(Candidate.id == candidate_id)
+            .execution_options(populate_existing=True)
+        )
+
+    async def get_candidates(self, cursor: Optional[str] = None, limit: int = 100) -> Page[Candidate]:
+        result = await self.db.scalars(keyset_page(self._select(), Candidate, cursor, limit))
+        return page_of(list(result.all()), limit)
+
+    async def get_candidate_fields(
+        self, fields: Sequence[str] = SUMMARY_FIELDS, cursor: Optional[str] = None, limit: int = 100
+    ) -> Page[Dict[str, Any]]:
+        """A page of candidates with only ``fields``, loaded as plain columns"""
+        result = await self.db.execute(keyset_page(projection(fields), Candidate, cursor, limit))
+        return projected_page(result.all(), fields, limit)
+
+    async def update_candidate(self, candidate_id: int, candidate_update: CandidateUpdate) -> Optional[Candidate]:
+        db_candidate = await self.get_candidate(candidate_id)
+        if not db_candidate:
+            return None
+
+        update_data = candidate_update.dict(exclude_unset=True)
+        if candidate_update.consent_given and not db_candidate.consent_given:
+            update_data["consent_date"] = datetime.utcnow()
+
+        for field, value in update_data.items():
+            setattr(db_candidate, field, value)
+
+        await self.db.commit()
+        return await self.get_candidate(candidate_id)
+
+    async def delete_candidate(self, candidate_id: int) -> bool:
+        db_candidate = await self.db.get(Candidate, candidate_id, options=loaders.CANDIDATE_DELETE)
+        if not db_candidate:
+            return False
+
+        await self.db.delete(db_candidate)
+        await self.db.commit()
+        return True
@@ -0,0 +1,199 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Select, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.background_check import BackgroundCheck
+from app.models.candidate import Candidate
+from app.models.check_result import CheckResult
+
+CHECK_COLUMNS = (
+    BackgroundCheck.id,
+    BackgroundCheck.candidate_id,
+    BackgroundCheck.status,
+    BackgroundCheck.criminal_check,
+    BackgroundCheck.education_verification,
+    BackgroundCheck.employment_verification,
+    BackgroundCheck.identity_verification,
+    BackgroundCheck.social_media_check,
+    BackgroundCheck.started_at,
+    BackgroundCheck.completed_at,
+    BackgroundCheck.created_at,
+)
+
+RESULT_COLUMNS = (
+    CheckResult.id,
+    CheckResult.check_type,
+    CheckResult.status,
+    CheckResult.result_data,
+    CheckResult.error_message,
+    CheckResult.completed_at,
+)
+
+CHECK_FIELDS = tuple(column.key for column in CHECK_COLUMNS)
+RESULT_FIELDS = tuple(column.key for column in RESULT_COLUMNS)
+
+# One CSV row per result, its check's fields first
+CSV_HEADER = (
+    *(f"check_{name}" if name == "id" else name for name in CHECK_FIELDS),
+    *(f"result_{name}" for name in RESULT_FIELDS),
+)
+
+# Output is handed to the response in pieces of about this many bytes
+FLUSH_BYTES = 64 * 1024
+
+
+def export_query(
+    organization_id: int,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> Select:
+    """An organization's checks created in ``[created_from, created_to)``, each followed by its results"""
+    result_join = [CheckResult.background_check_id == BackgroundCheck.id]
+    stmt = (
+        select(*CHECK_COLUMNS, *RESULT_COLUMNS)
+        .join(Candidate, BackgroundCheck.candidate_id == Candidate.id)
+        .where(Candidate.organization_id == organization_id)
+    )
+    if created_from is not None:
+        stmt = stmt.where(BackgroundCheck.created_at >= created_from)
+        # A result is never older than its check; the bound lets Postgres
+        # skip the check_results partitions before the range
+        result_join.append(CheckResult.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(BackgroundCheck.created_at < created_to)
+    return stmt.outerjoin(CheckResult, and_(*result_join)).order_by(BackgroundCheck.id, CheckResult.id)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _split(row) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    values = tuple(row)
+    check = dict(zip(CHECK_FIELDS, values[: len(CHECK_FIELDS)]))
+    result = dict(zip(RESULT_FIELDS, values[len(CHECK_FIELDS):]))
+    return check, result if result["id"] is not None else None
+
+
+class NdjsonWriter:
+    """One JSON object per check, with its results nested under ``check_results``
+
+    The query returns a check's rows together, so a check is written out as
+    soon as the next one starts and only one is held in memory at a time.
+    """
+
+    def __init__(self):
+        self._check: Optional[Dict[str, Any]] = None
+
+    def header(self) -> str:
+        return ""
+
+    def rows(self, row) -> str:
+        check, result = _split(row)
+        out = ""
+        if self._check is None or self._check["id"] != check["id"]:
+            out = self.close()
+            self._check = dict(check, check_results=[])
+        if result is not None:
+            result["result_data"] = json.loads(result["result_data"]) if result["result_data"] else None
+            self._check["check_results"].append(result)
+        return out
+
+    def close(self) -> str:
+        if self._check is None:
+            return ""
+        line = json.dumps(self._check, default=_json_default) + "\n"
+        self._check = None
+        return line
+
+
+class CsvWriter:
+    """One CSV row per result; a check without results gets one row of its own"""
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _line(self, values) -> str:
+        self._writer.writerow(values)
+        line = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return line
+
+    def header(self) -> str:
+        return self._line(CSV_HEADER)
+
+    def rows(self, row) -> str:
+        return self._line(
+            value.isoformat() if isinstance(value, datetime) else getattr(value, "value", value)
+            for value in tuple(row)
+        )
+
+    def close(self) -> str:
+        return ""
+
+
+WRITERS = {"ndjson": NdjsonWriter, "csv": CsvWriter}
+
+
+class BackgroundCheckExportService:
+    """Streams an organization's background checks and their results
+
+    Rows are read through a server-side cursor ``yield_per`` at a time and
+    written out as they arrive, so an export of millions of rows needs no
+    more memory than one batch. The export opens its own session, as it is
+    still running after the request's session has been closed.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], yield_per: int = 1000):
+        self.session_factory = session_factory
+        self.yield_per = yield_per
+
+    async def stream(
+        self,
+        fmt: str,
+        organization_id: int,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        gzip: bool = False,
+    ) -> AsyncIterator[bytes]:
+        writer = WRITERS[fmt]()
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        compressor = zlib.compressobj(wbits=31) if gzip else None
+        pending: List[str] = [writer.header()]
+        size = len(pending[0])
+
+        def drain() -> bytes:
+            data = "".join(pending).encode()
+            pending.clear()
+            return compressor.compress(data) if compressor else data
+
+        stmt = export_query(organization_id, created_from, created_to).execution_options(yield_per=self.yield_per)
+        async with self.session_factory() as db:
+            result = await db.stream(stmt)
+            async for row in result:
+                out = writer.rows(row)
+                if out:
+                    pending.append(out)
+                    size += len(out)
+                if size >= FLUSH_BYTES:
+                    data = drain()
+                    size = 0
+                    if data:
+                        yield data
+
+        pending.append(writer.close())
+        data = drain()
+        if compressor:
+            data += compressor.flush()
+        if data:
+            yield data
@@ -0,0 +1,32 @@
+"""Loader strategies for the relationships each response model serializes
+
+Every endpoint loads exactly what its response needs, and loads it up front:
+a ``selectinload`` costs one extra statement per relationship level, however
+many rows are on the page, where lazy loading costs one per row. They are
+also required under asyncio, where relationships cannot lazy-load at all.
+"""
+from sqlalchemy.orm import selectinload
+
+from app.models.background_check import BackgroundCheck
+from app.models.candidate import Candidate
+
+# BackgroundCheckResponse: the check and its check_results
+BACKGROUND_CHECK_RESPONSE = (
+    selectinload(BackgroundCheck.check_results),
+)
+
+# CandidateResponse: background_checks, each with its check_results
+CANDIDATE_RESPONSE = (
+    selectinload(Candidate.background_checks).selectinload(BackgroundCheck.check_results),
+)
+
+# Starting a check needs the plan tier of the candidate's organization
+BACKGROUND_CHECK_DISPATCH = (
+    selectinload(BackgroundCheck.candidate).selectinload(Candidate.organization),
+)
+
+# Deleting a candidate visits the rows that reference it
+CANDIDATE_DELETE = (
+    selectinload(Candidate.background_checks),
+    selectinload(Candidate.reports),
+)
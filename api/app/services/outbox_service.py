@@ -0,0 +1,118 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.celery_client import celery_client
+from app.models.outbox_event import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+def new_task_event(
+    task_name: str,
+    args: Optional[List[Any]] = None,
+    kwargs: Optional[Dict[str, Any]] = None,
+    queue: Optional[str] = None,
+) -> OutboxEvent:
+    return OutboxEvent(
+        task_name=task_name,
+        payload=json.dumps({"args": args or [], "kwargs": kwargs or {}, "queue": queue}),
+    )
+
+
+def send_event(event: OutboxEvent) -> bool:
+    """Hand ``event``'s task to the broker; False if it could not be sent"""
+    payload = json.loads(event.payload)
+    try:
+        celery_client.send_task(
+            event.task_name,
+            args=payload["args"],
+            kwargs=payload["kwargs"],
+            queue=payload["queue"],
+            retry=False,
+        )
+    except Exception:
+        logger.warning("Outbox event %s not published; leaving it to the relay", event.id, exc_info=True)
+        return False
+    return True
+
+
+def mark_published(event_id: int):
+    return (
+        update(OutboxEvent)
+        .where(OutboxEvent.id == event_id)
+        .where(OutboxEvent.published_at.is_(None))
+        .values(published_at=datetime.utcnow())
+    )
+
+
+class OutboxService:
+    """Transactional outbox for the Celery tasks the API triggers.
+
+    ``add_task`` stages an event in the caller's transaction, so the task is
+    recorded if and only if the change that needs it commits. After the
+    commit, ``publish`` hands the events to the broker straight away; any
+    that fail (e.g. Redis is briefly down) stay unpublished and the worker's
+    ``relay_outbox_events`` task sends them shortly after.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_task(
+        self,
+        task_name: str,
+        args: Optional[List[Any]] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+        queue: Optional[str] = None,
+    ) -> OutboxEvent:
+        event = new_task_event(task_name, args, kwargs, queue)
+        self.db.add(event)
+        return event
+
+    def publish(self, events: List[OutboxEvent]) -> int:
+        """Send committed events to the broker; returns how many were sent"""
+        published = 0
+        for event in events:
+            if send_event(event):
+                self.db.execute(mark_published(event.id))
+                published += 1
+        self.db.commit()
+        return published
+
+
+class AsyncOutboxService:
+    """``OutboxService`` for an ``AsyncSession``
+
+    The broker client is blocking, so sends run in a thread instead of on
+    the event loop.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def add_task(
+        self,
+        task_name: str,
+        args: Optional[List[Any]] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+        queue: Optional[str] = None,
+    ) -> OutboxEvent:
+        event = new_task_event(task_name, args, kwargs, queue)
+        self.db.add(event)
+        return event
+
+    async def publish(self, events: List[OutboxEvent]) -> int:
+        published = 0
+        for event in events:
+            if await asyncio.to_thread(send_event, event):
+                await self.db.execute(mark_published(event.id))
+                published += 1
+        await self.db.commit()
+        return published
@@ -0,0 +1,61 @@
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+import redis.asyncio as redis
+
+from app.models.background_check import CheckStatus
+
+# Events that end a background check's stream (see worker/progress.py)
+FINAL_EVENTS = ("check.completed", "check.failed")
+FINAL_STATUSES = (CheckStatus.COMPLETED.value, CheckStatus.FAILED.value, CheckStatus.CANCELLED.value)
+
+
+def progress_channel(check_id: int) -> str:
+    return f"background_check:{check_id}:events"
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class ProgressService:
+    """Relays the progress events workers publish for a check as Server-Sent Events.
+
+    The stream opens with a ``snapshot`` event of the check's current state,
+    read after subscribing so no event can slip in between, and ends after
+    the check completes or fails. Comment lines are sent every
+    ``keepalive_seconds`` so proxies keep an idle stream open.
+    """
+
+    def __init__(self, redis_client: redis.Redis, keepalive_seconds: float = 15.0):
+        self.redis = redis_client
+        self.keepalive_seconds = keepalive_seconds
+
+    async def stream(
+        self,
+        check_id: int,
+        load_snapshot: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+        is_disconnected: Callable[[], Awaitable[bool]],
+    ) -> AsyncIterator[str]:
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(progress_channel(check_id))
+        try:
+            snapshot = await load_snapshot()
+            if snapshot is None:
+                return
+            yield format_sse("snapshot", snapshot)
+            if snapshot["status"] in FINAL_STATUSES:
+                return
+
+            while not await is_disconnected():
+                message = await pubsub.get_message(timeout=self.keepalive_seconds)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                data = json.loads(message["data"])
+                yield format_sse(data["event"], data)
+                if data["event"] in FINAL_EVENTS:
+                    return
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.close()
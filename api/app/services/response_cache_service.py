@@ -0,0 +1,125 @@
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.redis_client import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+# Same script the worker bumps versions with (see worker/progress.py)
+BUMP_VERSION = """
+local version
+if redis.call('exists', KEYS[1]) == 1 then
+    version = redis.call('incr', KEYS[1])
+else
+    version = tonumber(ARGV[1])
+    redis.call('set', KEYS[1], version)
+end
+redis.call('pexpire', KEYS[1], ARGV[2])
+return version
+"""
+
+
+def check_version_key(check_id: int) -> str:
+    return f"background_check:{check_id}:version"
+
+
+def check_response_key(check_id: int, version: int) -> str:
+    return f"background_check:{check_id}:response:{version}"
+
+
+def etag_for(check_id: int, version: int) -> str:
+    return f'"{check_id}-{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _epoch() -> int:
+    # A fresh version starts from the clock, so it never repeats an old one
+    return time.time_ns() // 1000
+
+
+class CheckResponseCache:
+    """Read-through cache of serialized ``BackgroundCheckResponse`` bodies
+
+    Each check has a version stamp in Redis that every write to the check or
+    its results bumps, the worker's included. Bodies are cached under the
+    version they were read at, so a bump makes the old body unreachable and
+    it simply expires after ``ttl`` seconds. The version is read before the
+    database, so a body is never cached under a version newer than its data.
+    Redis failures are logged and the caller falls back to the database.
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl: float = 300.0, version_ttl: float = 30 * 24 * 3600):
+        self.redis = redis_client
+        self.ttl = ttl
+        self.version_ttl = version_ttl
+
+    async def version(self, check_id: int) -> Optional[int]:
+        """The check's current version, started if it has none; None without Redis"""
+        key = check_version_key(check_id)
+        try:
+            version = await self.redis.get(key)
+            if version is None:
+                # A concurrent bump wins, and its value is read back
+                await self.redis.set(key, _epoch(), nx=True, px=int(self.version_ttl * 1000))
+                version = await self.redis.get(key)
+        except redis.RedisError:
+            logger.warning("Response cache unavailable for background check %s", check_id, exc_info=True)
+            return None
+        return int(version) if version is not None else None
+
+    async def bump(self, check_id: int):
+        try:
+            await self.redis.eval(BUMP_VERSION, 1, check_version_key(check_id), _epoch(), int(self.version_ttl * 1000))
+        except redis.RedisError:
+            logger.warning("Failed to bump the version of background check %s", check_id, exc_info=True)
+
+    async def get_or_load(
+        self,
+        check_id: int,
+        version: int,
+        load: Callable[[], Awaitable[Optional[bytes]]],
+    ) -> Optional[bytes]:
+        """The body cached for ``version``, or ``load()``'s, which is then cached"""
+        key = check_response_key(check_id, version)
+        try:
+            body = await self.redis.get(key)
+        except redis.RedisError:
+            logger.warning("Failed to read cached response of background check %s", check_id, exc_info=True)
+            return await load()
+        if body is not None:
+            return body
+
+        body = await load()
+        if body is not None:
+            try:
+                await self.redis.set(key, body, px=int(self.ttl * 1000))
+            except redis.RedisError:
+                logger.warning("Failed to cache response of background check %s", check_id, exc_info=True)
+        return body
+
+
+def bump_check_version(check_id: int, redis_factory=get_redis):
+    """``CheckResponseCache.bump`` for the synchronous services"""
+    try:
+        redis_factory().eval(
+            BUMP_VERSION, 1, check_version_key(check_id), _epoch(), int(settings.CHECK_VERSION_TTL_SECONDS * 1000)
+        )
+    except redis.RedisError:
+        logger.warning("Failed to bump the version of background check %s", check_id, exc_info=True)
+
+
+def check_response_cache() -> CheckResponseCache:
+    return CheckResponseCache(
+        get_async_redis(),
+        ttl=settings.CHECK_RESPONSE_CACHE_TTL_SECONDS,
+        version_ttl=settings.CHECK_VERSION_TTL_SECONDS,
+    )
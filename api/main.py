@@ -5,6 +5,7 @@ from contextlib import asynccontextmanager
 import uvicorn
 
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.core.database import engine, Base
 from app.api.v1.api import api_router
 
@@ -33,6 +34,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include API router
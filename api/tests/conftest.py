@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db():
+    """SQLite session seeded with 30 candidates, each with two checks of two results"""
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.database import Base
+    from app.models import BackgroundCheck, Candidate, CheckResult
+    from app.models.check_result import CheckType, ResultStatus
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    # Rows are created in pairs sharing a timestamp. The timestamps are set
+    # explicitly, as SQLite's CURRENT_TIMESTAMP is stored in another format
+    created_at = datetime(2025, 10, 1, 9, 0, 0, 123456)
+    result_id = 0
+    for candidate_id in range(1, 31):
+        created_at += timedelta(seconds=candidate_id % 2)
+        session.add(Candidate(
+            created_at=created_at,
+            id=candidate_id,
+            email=f"candidate{candidate_id}@example.com",
+            first_name="Test",
+            last_name=f"Candidate {candidate_id}",
+            organization_id=1,
+            created_by_user_id=1,
+        ))
+        for _ in range(2):
+            check = BackgroundCheck(created_at=created_at, candidate_id=candidate_id, created_by_user_id=1, criminal_check=True, identity_verification=True)
+            session.add(check)
+            session.flush()
+            for check_type in (CheckType.CRIMINAL, CheckType.IDENTITY):
+                # SQLite has no sequences to feed the partitioned table's id
+                result_id += 1
+                session.add(CheckResult(id=result_id, background_check_id=check.id, check_type=check_type, status=ResultStatus.PASS))
+    session.commit()
+    session.close()
+
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from app.models.background_check import CheckStatus
+from app.models.check_result import CheckType, ResultStatus
+from app.services.export_service import CSV_HEADER, CsvWriter, NdjsonWriter
+
+CREATED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def row(check_id, result_id=None, check_type=None, result_data=None):
+    check = (check_id, 10 + check_id, CheckStatus.COMPLETED, True, False, False, False, False, None, None, CREATED)
+    if result_id is None:
+        return check + (None,) * 6
+    return check + (result_id, check_type, ResultStatus.PASS, result_data, None, CREATED)
+
+
+ROWS = [
+    row(1, 1, CheckType.CRIMINAL, '{"records": 0}'),
+    row(1, 2, CheckType.IDENTITY),
+    row(2),
+    row(3, 3, CheckType.EDUCATION),
+]
+
+
+def write(writer):
+    return writer.header() + "".join(writer.rows(r) for r in ROWS) + writer.close()
+
+
+def test_ndjson_nests_results_under_their_check():
+    checks = [json.loads(line) for line in write(NdjsonWriter()).splitlines()]
+
+    assert [check["id"] for check in checks] == [1, 2, 3]
+    assert [result["id"] for result in checks[0]["check_results"]] == [1, 2]
+    assert checks[0]["check_results"][0]["result_data"] == {"records": 0}
+    assert checks[0]["check_results"][0]["check_type"] == "criminal"
+    assert checks[0]["status"] == "completed"
+    assert checks[0]["created_at"] == CREATED.isoformat()
+    assert checks[1]["check_results"] == []
+
+
+def test_csv_writes_a_row_per_result():
+    rows = list(csv.reader(io.StringIO(write(CsvWriter()))))
+
+    assert tuple(rows[0]) == CSV_HEADER
+    assert [(r[0], r[CSV_HEADER.index("result_id")]) for r in rows[1:]] == [("1", "1"), ("1", "2"), ("2", ""), ("3", "3")]
+    assert rows[1][CSV_HEADER.index("result_check_type")] == "criminal"
@@ -0,0 +1,63 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+    from app.services.background_check_service import BackgroundCheckService
+    from app.services.candidate_service import CandidateService
+    APP_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: Could not import app services: {e}")
+    APP_AVAILABLE = False
+
+
+def walk(fetch, limit):
+    """Every row, following next cursors page by page"""
+    rows, cursor = [], None
+    while True:
+        page = fetch(cursor=cursor, limit=limit)
+        rows.extend(page.items)
+        if page.next_cursor is None:
+            return rows
+        cursor = page.next_cursor
+
+
+@pytest.mark.skipif(not APP_AVAILABLE, reason="App not available")
+@pytest.mark.parametrize("limit", [1, 7, 30, 100])
+def test_cursor_walk_visits_every_candidate_once(db, limit):
+    """Pages neither skip nor repeat rows, even when created_at ties"""
+    candidates = walk(CandidateService(db).get_candidates, limit)
+
+    assert [c.id for c in candidates] == list(range(30, 0, -1))
+
+
+@pytest.mark.skipif(not APP_AVAILABLE, reason="App not available")
+def test_cursor_walk_is_stable_across_inserts(db):
+    """Rows created after the walk started do not shift later pages"""
+    service = BackgroundCheckService(db)
+    first = service.get_background_checks(limit=25)
+
+    from datetime import datetime
+
+    from app.models import BackgroundCheck
+    db.add(BackgroundCheck(created_at=datetime(2025, 10, 2), candidate_id=1, created_by_user_id=1))
+    db.commit()
+
+    rest = walk(lambda cursor, limit: service.get_background_checks(cursor=cursor or first.next_cursor, limit=limit), 25)
+    ids = [c.id for c in first.items + rest]
+    assert ids == list(range(60, 0, -1))
+
+
+@pytest.mark.skipif(not APP_AVAILABLE, reason="App not available")
+def test_cursor_round_trip_and_rejects_garbage():
+    from datetime import datetime, timezone
+
+    created_at = datetime(2025, 10, 9, 11, 2, 51, 204377, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    for token in ("not-a-cursor", "W10", encode_cursor(created_at, 42)[:-3]):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(token)
@@ -0,0 +1,85 @@
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from sqlalchemy import event
+
+    from app.schemas.background_check import BackgroundCheckResponse
+    from app.schemas.candidate import CandidateResponse
+    from app.services.background_check_service import BackgroundCheckService
+    from app.services.candidate_service import CandidateService
+    APP_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: Could not import app models: {e}")
+    APP_AVAILABLE = False
+
+
+@contextmanager
+def count_queries(session):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.skipif(not APP_AVAILABLE, reason="App not available")
+@pytest.mark.parametrize("limit", [1, 10, 30])
+def test_candidate_list_runs_constant_queries(db, limit):
+    """Listing candidates costs the same statements however large the page"""
+    with count_queries(db) as statements:
+        candidates = CandidateService(db).get_candidates(limit=limit).items
+        response = [CandidateResponse.model_validate(c) for c in candidates]
+
+    assert len(response) == limit
+    assert all(len(c.background_checks) == 2 for c in response)
+    # candidates, their background checks, and those checks' results
+    assert len(statements) == 3
+
+
+@pytest.mark.skipif(not APP_AVAILABLE, reason="App not available")
+@pytest.mark.parametrize("limit", [1, 10, 60])
+def test_background_check_list_runs_constant_queries(db, limit):
+    """Listing background checks costs the same statements however large the page"""
+    with count_queries(db) as statements:
+        checks = BackgroundCheckService(db).get_background_checks(limit=limit).items
+        response = [BackgroundCheckResponse.model_validate(c) for c in checks]
+
+    assert len(response) == limit
+    assert all(len(c.check_results) == 2 for c in response)
+    # background checks and their results
+    assert len(statements) == 2
+
+
+@pytest.mark.skipif(not APP_AVAILABLE, reason="App not available")
+@pytest.mark.parametrize("limit", [1, 30])
+def test_candidate_summary_runs_one_query(db, limit):
+    """The summary view reads its columns, latest check status included, in one statement"""
+    from app.services.candidate_service import SUMMARY_FIELDS
+
+    with count_queries(db) as statements:
+        page = CandidateService(db).get_candidate_fields(SUMMARY_FIELDS, limit=limit)
+
+    assert len(statements) == 1
+    assert "background_checks" not in page.items[0]
+    assert [list(row) for row in page.items] == [list(SUMMARY_FIELDS)] * limit
+    assert {row["latest_check_status"] for row in page.items} == {"pending"}
+
+
+@pytest.mark.skipif(not APP_AVAILABLE, reason="App not available")
+def test_candidate_fields_rejects_unknown_fields(db):
+    from app.services.candidate_service import UnknownFields
+
+    with pytest.raises(UnknownFields):
+        CandidateService(db).get_candidate_fields(["id", "ssn"])
@@ -0,0 +1,72 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import fakeredis
+    import fakeredis.aioredis
+    from app.services.response_cache_service import CheckResponseCache, bump_check_version, etag_for, etag_matches
+    APP_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: Could not import response cache: {e}")
+    APP_AVAILABLE = False
+
+
+@pytest.mark.skipif(not APP_AVAILABLE, reason="App not available")
+@pytest.mark.asyncio
+async def test_cached_body_is_served_until_the_version_is_bumped():
+    cache = CheckResponseCache(fakeredis.aioredis.FakeRedis())
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return b'{"id": 1, "status": "pending"}'
+
+    version = await cache.version(1)
+    assert await cache.version(1) == version
+    assert await cache.get_or_load(1, version, load) == await cache.get_or_load(1, version, load)
+    assert len(loads) == 1
+
+    await cache.bump(1)
+    bumped = await cache.version(1)
+    assert bumped == version + 1
+    await cache.get_or_load(1, bumped, load)
+    assert len(loads) == 2
+
+
+@pytest.mark.skipif(not APP_AVAILABLE, reason="App not available")
+@pytest.mark.asyncio
+async def test_missing_check_is_not_cached():
+    cache = CheckResponseCache(fakeredis.aioredis.FakeRedis())
+
+    async def load():
+        return None
+
+    version = await cache.version(2)
+    assert await cache.get_or_load(2, version, load) is None
+    assert await cache.redis.keys("background_check:2:response:*") == []
+
+
+@pytest.mark.skipif(not APP_AVAILABLE, reason="App not available")
+@pytest.mark.asyncio
+async def test_synchronous_bump_invalidates_the_cached_version():
+    server = fakeredis.FakeServer()
+    cache = CheckResponseCache(fakeredis.aioredis.FakeRedis(server=server))
+
+    version = await cache.version(4)
+    bump_check_version(4, redis_factory=lambda: fakeredis.FakeRedis(server=server))
+
+    assert await cache.version(4) == version + 1
+
+
+@pytest.mark.skipif(not APP_AVAILABLE, reason="App not available")
+def test_etag_matching():
+    etag = etag_for(3, 17)
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"3-16", W/{etag}', etag)
+    assert not etag_matches('"3-16"', etag)
+    assert not etag_matches(None, etag)
@@ -3,7 +3,10 @@ from celery.schedules import crontab
 import os
 from dotenv import load_dotenv
 
+from worker.serialization import SERIALIZER, register_serializer
+
 load_dotenv()
+register_serializer()
 
 # Create Celery instance
 celery_app = Celery(
@@ -15,15 +18,24 @@ celery_app = Celery(
 
 # Celery configuration
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    # Compact msgpack bodies, compressed above TASK_COMPRESS_THRESHOLD_BYTES;
+    # json stays accepted for tasks the API sends
+    task_serializer=SERIALIZER,
+    accept_content=[SERIALIZER, "json"],
+    result_serializer=SERIALIZER,
+    result_accept_content=[SERIALIZER, "json"],
+    result_expires=int(os.getenv("RESULT_EXPIRES_SECONDS", "3600")),
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
     worker_prefetch_multiplier=1,
+    # A worker consuming several queues drains them in the order given to -Q
+    # instead of round-robin, so a higher tier always goes first. That can
+    # starve the queues listed later while the earlier ones stay busy, which
+    # is why each plan tier gets a worker of its own in docker-compose.
+    broker_transport_options={"queue_order_strategy": "priority"},
     worker_max_tasks_per_child=1000,
 )
 
@@ -33,6 +45,18 @@ celery_app.conf.beat_schedule = {
         "task": "worker.tasks.process_pending_checks",
         "schedule": crontab(minute="*/5"),  # Every 5 minutes
     },
+    "relay-outbox-events": {
+        "task": "worker.tasks.relay_outbox_events",
+        "schedule": float(os.getenv("OUTBOX_RELAY_INTERVAL_SECONDS", "5")),
+    },
+    "purge-published-outbox-events": {
+        "task": "worker.tasks.purge_published_outbox_events",
+        "schedule": crontab(minute=30),  # Hourly
+    },
+    "maintain-check-result-partitions": {
+        "task": "worker.tasks.maintain_check_result_partitions",
+        "schedule": crontab(hour=1, minute=0),  # Daily at 1 AM
+    },
     "cleanup-old-results": {
         "task": "worker.tasks.cleanup_old_results",
         "schedule": crontab(hour=2, minute=0),  # Daily at 2 AM
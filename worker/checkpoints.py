@@ -0,0 +1,97 @@
+import json
+import logging
+import os
+from typing import Any, Callable, Dict
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from worker.models import CheckResult, CheckType, ResultStatus
+from worker.redis_client import get_redis
+from worker.services.single_flight import RELEASE_LOCK
+
+logger = logging.getLogger(__name__)
+
+# Results that settle a sub-check; anything else (ERROR, PENDING) is re-run
+TERMINAL_STATUSES = (ResultStatus.PASS, ResultStatus.FAIL)
+
+
+class SubCheckInFlight(Exception):
+    """Another delivery of the same sub-check is running right now"""
+
+    def __init__(self, key: str, retry_after: float):
+        super().__init__(f"Sub-check {key} is already in flight; retry in {retry_after:.0f}s")
+        self.key = key
+        self.retry_after = retry_after
+
+
+def idempotency_key(check_id: int, check_type: CheckType) -> str:
+    """A sub-check is identified by its background check and type, whatever the delivery"""
+    return f"{check_id}:{CheckType(check_type).value}"
+
+
+def completed_results(db: Session, check_id: int) -> Dict[CheckType, Dict[str, Any]]:
+    """The recorded PASS/FAIL result of each sub-check of ``check_id`` that has one"""
+    rows = db.execute(
+        select(CheckResult.check_type, CheckResult.result_data)
+        .where(CheckResult.background_check_id == check_id)
+        .where(CheckResult.status.in_(TERMINAL_STATUSES))
+        .order_by(CheckResult.id)
+    ).all()
+    return {check_type: json.loads(result_data) if result_data else {} for check_type, result_data in rows}
+
+
+class InFlightClaims:
+    """Redis claims that keep duplicate deliveries of a sub-check from running at once
+
+    The claim is held by a token unique to one delivery, so any other copy
+    of the message (a redelivery after a lost ack, a re-dispatch of the
+    whole check, or a retry while the claim is still held) has to wait
+    until it is released. Claims expire after ``ttl`` seconds in case their
+    holder dies. Redis failures grant the claim; the check for an existing
+    result still prevents duplicate rows once the first delivery has
+    finished.
+    """
+
+    def __init__(self, redis_factory: Callable[[], redis.Redis], ttl: float = 1800.0, max_poll: float = 60.0):
+        self.redis_factory = redis_factory
+        self.ttl = ttl
+        self.max_poll = max_poll
+
+    def claim(self, key: str, owner: str) -> bool:
+        try:
+            return bool(self.redis_factory().set(self._key(key), owner, nx=True, px=int(self.ttl * 1000)))
+        except redis.RedisError:
+            logger.warning("In-flight claim unavailable for %s; proceeding", key, exc_info=True)
+            return True
+
+    def retry_after(self, key: str, min_poll: float = 5.0) -> float:
+        """Seconds a delivery refused the claim should wait before asking again
+
+        Up to the claim's expiry, so a claim left by a dead worker does not
+        use up the waiting delivery's retries, but never longer than
+        ``max_poll`` in case the holder finishes early.
+        """
+        try:
+            remaining = self.redis_factory().pttl(self._key(key)) / 1000
+        except redis.RedisError:
+            remaining = 0
+        return min(max(remaining, min_poll), self.max_poll)
+
+    def release(self, key: str, owner: str):
+        try:
+            self.redis_factory().eval(RELEASE_LOCK, 1, self._key(key), owner)
+        except redis.RedisError:
+            logger.warning("Failed to release in-flight claim for %s", key, exc_info=True)
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return f"sub_check:in_flight:{key}"
+
+
+in_flight = InFlightClaims(
+    get_redis,
+    ttl=float(os.getenv("SUB_CHECK_CLAIM_SECONDS", "1800")),
+    max_poll=float(os.getenv("SUB_CHECK_CLAIM_POLL_SECONDS", "60")),
+)
@@ -0,0 +1,224 @@
+import json
+import os
+from contextlib import nullcontext
+from datetime import datetime
+from typing import ContextManager, Dict, Any, Optional
+
+import httpx
+from sqlalchemy import select, update
+
+from worker.checkpoints import TERMINAL_STATUSES, SubCheckInFlight, completed_results, idempotency_key, in_flight
+from worker.database import SessionLocal
+from worker.models import Candidate, CheckResult, CheckType, ResultStatus
+from worker.services.circuit_breaker import CircuitOpen, is_provider_failure, provider_breaker
+from worker.services.hedging import hedger
+from worker.services.micro_batcher import MicroBatchError, micro_batcher
+from worker.services.rate_limiter import ProviderThrottled, provider_limiter
+from worker.services.registry import CheckProvider, get_provider
+from worker.services.result_cache import result_cache, candidate_fingerprint
+from worker.services.single_flight import SingleFlightError, single_flight
+
+# Coalesce concurrent identical provider calls across the cluster
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+# Throttle provider calls with the shared token buckets and AIMD limits
+PROVIDER_LIMITS_ENABLED = os.getenv("PROVIDER_LIMITS_ENABLED", "true").lower() == "true"
+
+# Fail fast on providers whose shared circuit breaker is open
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+
+# Send a duplicate provider call once the first runs past the provider's p95
+HEDGING_ENABLED = os.getenv("HEDGING_ENABLED", "false").lower() == "true"
+
+# Group lookups for providers with a bulk endpoint into micro-batches
+MICRO_BATCH_ENABLED = os.getenv("MICRO_BATCH_ENABLED", "true").lower() == "true"
+
+
+def is_transient(exc: Exception) -> bool:
+    """Errors worth retrying the sub-check for, rather than failing it"""
+    if isinstance(exc, (CircuitOpen, SingleFlightError, MicroBatchError)) or is_provider_failure(exc):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429
+
+
+def _limited(provider: CheckProvider) -> ContextManager[None]:
+    if PROVIDER_LIMITS_ENABLED:
+        return provider_limiter.slot(provider.check_type)
+    return nullcontext()
+
+
+def _guarded(provider: CheckProvider) -> ContextManager[None]:
+    if CIRCUIT_BREAKER_ENABLED:
+        return provider_breaker.guard(provider.check_type)
+    return nullcontext()
+
+
+def _load_fingerprint(candidate_id: int) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+        return candidate_fingerprint(candidate) if candidate else None
+    finally:
+        db.close()
+
+
+def _recorded_result(check_id: int, check_type: CheckType) -> Optional[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        return completed_results(db, check_id).get(check_type)
+    finally:
+        db.close()
+
+
+def _record_result(row: Dict[str, Any]):
+    """Commit one sub-check's CheckResult; the task is acked only after this returns
+
+    The PENDING placeholder created when the check was started, or the
+    ERROR row of an earlier run, is filled in rather than a second row
+    added, so each sub-check keeps a single row.
+    """
+    db = SessionLocal()
+    try:
+        placeholder_id = db.execute(
+            select(CheckResult.id)
+            .where(CheckResult.background_check_id == row["background_check_id"])
+            .where(CheckResult.check_type == row["check_type"])
+            .where(CheckResult.status.notin_(TERMINAL_STATUSES))
+            .order_by(CheckResult.id)
+            .limit(1)
+            .with_for_update()
+        ).scalar_one_or_none()
+        if placeholder_id is None:
+            db.add(CheckResult(**row))
+        else:
+            db.execute(update(CheckResult).where(CheckResult.id == placeholder_id).values(**row))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _perform_check(provider: CheckProvider, candidate_id: int, bypass_cache: bool) -> Dict[str, Any]:
+    """Answer a check from the result cache, falling back to the provider
+
+    Provider calls for the same check type and candidate identity that are
+    in flight at the same time anywhere in the cluster are coalesced into a
+    single upstream request. Upstream calls are throttled per provider and
+    raise ``ProviderThrottled`` when no capacity is free, fail fast with
+    ``CircuitOpen`` while the provider's circuit is open and, if enabled,
+    are hedged once they run slower than the provider's p95. Providers with
+    a bulk endpoint have their lookups micro-batched.
+    """
+    use_cache = result_cache.enabled(provider.check_type)
+    fingerprint = None
+    if use_cache or SINGLE_FLIGHT_ENABLED:
+        fingerprint = _load_fingerprint(candidate_id)
+
+    if fingerprint is not None and use_cache and not bypass_cache:
+        cached = result_cache.get(provider.check_type, fingerprint)
+        if cached is not None:
+            entry, tier = cached
+            result = dict(entry["result"], candidate_id=candidate_id)
+            result["source"] = {"origin": "cache", "tier": tier, "cached_at": entry["cached_at"]}
+            return result
+
+    def attempt() -> Dict[str, Any]:
+        with _limited(provider):
+            if MICRO_BATCH_ENABLED and provider.service.supports_bulk:
+                return micro_batcher.perform(provider.check_type, provider.service, candidate_id)
+            return provider.service.perform_check(candidate_id)
+
+    def call_provider() -> Dict[str, Any]:
+        with _guarded(provider):
+            result = hedger.call(provider.check_type, attempt) if HEDGING_ENABLED else attempt()
+        if fingerprint is not None and use_cache and "error" not in result:
+            result_cache.set(provider.check_type, fingerprint, result)
+        return result
+
+    if SINGLE_FLIGHT_ENABLED:
+        identity = fingerprint or f"candidate-{candidate_id}"
+        # A throttled leader is not an answer; its waiters get throttled themselves
+        result = single_flight.do(
+            f"{provider.check_type.value}:{identity}", call_provider, private_errors=(ProviderThrottled, CircuitOpen)
+        )
+        # A coalesced answer may have been fetched for another candidate row
+        result = dict(result, candidate_id=candidate_id)
+    else:
+        result = call_provider()
+    return dict(result, source={"origin": "provider"})
+
+
+def execute_check(
+    check_id: int,
+    candidate_id: int,
+    check_type: CheckType,
+    bypass_cache: bool = False,
+    final_attempt: bool = True,
+    owner: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run the registered provider for ``check_type`` and record its CheckResult
+
+    This is the single path every sub-check goes through, so behaviour that
+    applies to all providers belongs here rather than in the services.
+    Answers are served from the result cache unless ``bypass_cache`` is set;
+    the recorded result notes whether it came from the cache or the provider.
+    A transient failure only records an ERROR row on the ``final_attempt``;
+    earlier attempts leave it to the retry.
+
+    Sub-checks are idempotent per background check and type: a sub-check
+    that already has a PASS/FAIL row returns that result without calling the
+    provider again, and while ``owner`` (a token unique to this delivery)
+    runs it, other deliveries of the same sub-check raise ``SubCheckInFlight``.
+    """
+    provider = get_provider(check_type)
+    key = idempotency_key(check_id, provider.check_type)
+    if owner is not None and not in_flight.claim(key, owner):
+        raise SubCheckInFlight(key, retry_after=in_flight.retry_after(key))
+    try:
+        # Checked under the claim, so a delivery that finished just before
+        # we took it is seen here
+        recorded = _recorded_result(check_id, provider.check_type)
+        if recorded is not None:
+            return recorded
+        return _run_check(provider, check_id, candidate_id, bypass_cache, final_attempt)
+    finally:
+        if owner is not None:
+            in_flight.release(key, owner)
+
+
+def _run_check(
+    provider: CheckProvider,
+    check_id: int,
+    candidate_id: int,
+    bypass_cache: bool,
+    final_attempt: bool,
+) -> Dict[str, Any]:
+    try:
+        result = _perform_check(provider, candidate_id, bypass_cache)
+    except ProviderThrottled:
+        # Nothing ran yet; the caller defers the sub-check
+        raise
+    except Exception as e:
+        if not final_attempt and is_transient(e):
+            raise
+        # Save error result
+        _record_result({
+            "background_check_id": check_id,
+            "check_type": provider.check_type,
+            "status": ResultStatus.ERROR,
+            "result_data": None,
+            "error_message": str(e),
+            "completed_at": datetime.utcnow(),
+        })
+        raise
+
+    # Save result to database
+    _record_result({
+        "background_check_id": check_id,
+        "check_type": provider.check_type,
+        "status": provider.outcome(result),
+        "result_data": json.dumps(result),
+        "error_message": None,
+        "completed_at": datetime.utcnow(),
+    })
+
+    return result
@@ -1,5 +1,7 @@
+from .organization import Organization
 from .candidate import Candidate
-from .background_check import BackgroundCheck
-from .check_result import CheckResult, CheckType, ResultStatus, CheckStatus
+from .background_check import BackgroundCheck, CheckStatus
+from .check_result import CheckResult, CheckType, ResultStatus
+from .outbox_event import OutboxEvent
 
-__all__ = ["Candidate", "BackgroundCheck", "CheckResult", "CheckType", "ResultStatus", "CheckStatus"]
+__all__ = ["Organization", "Candidate", "BackgroundCheck", "CheckResult", "CheckType", "ResultStatus", "CheckStatus", "OutboxEvent"]
@@ -2,9 +2,7 @@ from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, E
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
-from sqlalchemy.ext.declarative import declarative_base
-
-Base = declarative_base()
+from .base import Base
 
 
 class CheckStatus(str, enum.Enum):
@@ -29,6 +27,9 @@ class BackgroundCheck(Base):
     identity_verification = Column(Boolean, default=False)
     social_media_check = Column(Boolean, default=False)
     
+    # Dispatch lease: set when process_pending_checks claims the check
+    claimed_at = Column(DateTime(timezone=True))
+
     # Timestamps
     started_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
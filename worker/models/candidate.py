@@ -1,9 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from sqlalchemy.ext.declarative import declarative_base
-
-Base = declarative_base()
+from .base import Base
 
 
 class Candidate(Base):
@@ -19,10 +17,12 @@ class Candidate(Base):
     address = Column(Text)
     consent_given = Column(Boolean, default=False)
     consent_date = Column(DateTime)
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
+    organization = relationship("Organization", back_populates="candidates")
     background_checks = relationship("BackgroundCheck", back_populates="candidate")
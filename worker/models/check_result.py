@@ -1,10 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Enum, Sequence
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
-from sqlalchemy.ext.declarative import declarative_base
-
-Base = declarative_base()
+from .base import Base
 
 
 class CheckType(str, enum.Enum):
@@ -24,8 +22,12 @@ class ResultStatus(str, enum.Enum):
 
 class CheckResult(Base):
     __tablename__ = "check_results"
+    # Range-partitioned by month; partitions are managed by the worker
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
-    id = Column(Integer, primary_key=True, index=True)
+    # The partition key has to be part of the primary key, so id is fed
+    # from its sequence explicitly rather than being a SERIAL primary key
+    id = Column(Integer, Sequence("check_results_id_seq"), primary_key=True, index=True)
     background_check_id = Column(Integer, ForeignKey("background_checks.id"), nullable=False)
     check_type = Column(Enum(CheckType), nullable=False)
     status = Column(Enum(ResultStatus), default=ResultStatus.PENDING)
@@ -35,7 +37,7 @@ class CheckResult(Base):
     # Timestamps
     started_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
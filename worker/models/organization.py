@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class Organization(Base):
+    __tablename__ = "organizations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False, index=True)
+    is_active = Column(Boolean, default=True)
+    
+    # Subscription/Plan info
+    plan_type = Column(String, default="basic")  # basic, premium, enterprise
+    max_candidates_per_month = Column(Integer, default=100)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    candidates = relationship("Candidate", back_populates="organization")
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class OutboxEvent(Base):
+    """A Celery task to send, written in the same transaction as the change that needs it"""
+
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_name = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON: args, kwargs and queue
+    attempts = Column(Integer, default=0, nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    published_at = Column(DateTime(timezone=True))  # NULL until handed to the broker
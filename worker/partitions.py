@@ -0,0 +1,85 @@
+import logging
+import re
+from datetime import date, datetime
+from typing import List
+
+from sqlalchemy import text
+
+from worker.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "check_results"
+PARTITION_NAME = re.compile(r"^check_results_y(\d{4})m(\d{2})$")
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def ensure_check_result_partitions(months_ahead: int = 3) -> List[str]:
+    """Create the monthly check_results partitions from this month onwards
+
+    Returns the names of the partitions that were checked or created. Safe
+    to run repeatedly; existing partitions are left alone.
+    """
+    first = _month_start(datetime.utcnow().date())
+    names = []
+    db = SessionLocal()
+    try:
+        for offset in range(months_ahead + 1):
+            lower = _add_months(first, offset)
+            upper = _add_months(lower, 1)
+            name = partition_name(lower)
+            db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+            ))
+            names.append(name)
+        db.commit()
+    finally:
+        db.close()
+    return names
+
+
+def drop_expired_check_result_partitions(cutoff: datetime) -> List[str]:
+    """Detach and drop every monthly partition that lies wholly before ``cutoff``
+
+    Rows in the partition that straddles the cutoff are left for the chunked
+    purge in ``worker.retention``.
+    """
+    dropped = []
+    db = SessionLocal()
+    try:
+        partitions = db.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ), {"parent": PARENT_TABLE}).scalars().all()
+
+        for name in sorted(partitions):
+            match = PARTITION_NAME.match(name)
+            if not match:
+                continue
+            upper = _add_months(date(int(match.group(1)), int(match.group(2)), 1), 1)
+            if upper > cutoff.date():
+                continue
+            db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            db.execute(text(f"DROP TABLE {name}"))
+            # One partition per transaction keeps the parent's lock short
+            db.commit()
+            logger.info("Retention: dropped partition %s", name)
+            dropped.append(name)
+    finally:
+        db.close()
+    return dropped
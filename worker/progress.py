@@ -0,0 +1,71 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any
+
+import redis
+
+from worker.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Events that end a background check's stream
+FINAL_EVENTS = ("check.completed", "check.failed")
+
+# Sets a missing version to a time-based epoch rather than 1, so versions
+# never repeat for a check after its key expired or Redis lost it
+BUMP_VERSION = """
+local version
+if redis.call('exists', KEYS[1]) == 1 then
+    version = redis.call('incr', KEYS[1])
+else
+    version = tonumber(ARGV[1])
+    redis.call('set', KEYS[1], version)
+end
+redis.call('pexpire', KEYS[1], ARGV[2])
+return version
+"""
+
+CHECK_VERSION_TTL_SECONDS = int(os.getenv("CHECK_VERSION_TTL_SECONDS", str(30 * 24 * 3600)))
+
+
+def progress_channel(check_id: int) -> str:
+    return f"background_check:{check_id}:events"
+
+
+def publish_progress(check_id: int, event: str, **data: Any):
+    """Tell anyone watching ``check_id`` (e.g. the API's SSE stream) what just happened
+
+    Progress events are best effort: they are published on the check's
+    Redis channel and never saved, and a Redis failure is only logged.
+    """
+    message = {"event": event, "check_id": check_id, "at": datetime.utcnow().isoformat(), **data}
+    try:
+        get_redis().publish(progress_channel(check_id), json.dumps(message))
+    except redis.RedisError:
+        logger.warning("Failed to publish %s for background check %s", event, check_id, exc_info=True)
+
+
+def check_version_key(check_id: int) -> str:
+    return f"background_check:{check_id}:version"
+
+
+def bump_check_version(check_id: int):
+    """Mark everything cached about ``check_id`` out of date
+
+    Called after every committed write to a background check or its
+    results; the API keys its response cache and ETags on this version.
+    A Redis failure is only logged, and cached responses expire on their own.
+    """
+    try:
+        get_redis().eval(
+            BUMP_VERSION,
+            1,
+            check_version_key(check_id),
+            time.time_ns() // 1000,
+            CHECK_VERSION_TTL_SECONDS * 1000,
+        )
+    except redis.RedisError:
+        logger.warning("Failed to bump the version of background check %s", check_id, exc_info=True)
@@ -0,0 +1,20 @@
+import os
+from typing import Optional
+
+import redis
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+_redis: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Return the Redis client shared by the worker's caches, locks and limiters
+
+    redis-py's connection pool notices a fork and reconnects, so a client
+    created before the worker forks is still safe to use afterwards.
+    """
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(REDIS_URL)
+    return _redis
@@ -0,0 +1,87 @@
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import ColumnElement, Table, select, delete
+
+from worker.database import SessionLocal
+from worker.models import CheckResult, OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+check_results = CheckResult.__table__
+outbox_events = OutboxEvent.__table__
+
+
+def _delete_in_chunks(
+    table: Table,
+    condition: ColumnElement[bool],
+    chunk_size: int,
+    pause: float,
+    on_progress: Optional[Callable[[int, int], None]],
+) -> int:
+    deleted = 0
+    last_id = 0
+    while True:
+        chunk = (
+            select(table.c.id)
+            .where(condition)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(chunk_size)
+        )
+        db = SessionLocal()
+        try:
+            ids = db.execute(
+                delete(table)
+                .where(table.c.id.in_(chunk.scalar_subquery()))
+                # Repeated here so Postgres prunes to the matching partitions
+                .where(condition)
+                .returning(table.c.id)
+            ).scalars().all()
+            db.commit()
+        finally:
+            db.close()
+
+        if not ids:
+            break
+
+        deleted += len(ids)
+        last_id = max(ids)
+        logger.info("Retention: deleted %d %s so far (through id %d)", deleted, table.name, last_id)
+        if on_progress is not None:
+            on_progress(deleted, last_id)
+
+        if len(ids) < chunk_size:
+            break
+        if pause:
+            time.sleep(pause)
+
+    return deleted
+
+
+def purge_check_results(
+    cutoff: datetime,
+    chunk_size: int = 5000,
+    pause: float = 0.0,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """Delete check results created before ``cutoff`` in bounded chunks
+
+    Rows are walked in primary-key order and removed with one set-based
+    ``DELETE ... WHERE id IN (...)`` per chunk, each in its own transaction,
+    so memory stays flat and locks and WAL are released as we go. ``pause``
+    sleeps between chunks to throttle the job; ``on_progress`` is called with
+    the running total and the last id deleted after every chunk.
+    """
+    return _delete_in_chunks(check_results, check_results.c.created_at < cutoff, chunk_size, pause, on_progress)
+
+
+def purge_outbox_events(cutoff: datetime, chunk_size: int = 5000, pause: float = 0.0) -> int:
+    """Delete outbox events published before ``cutoff``, chunked as in ``purge_check_results``
+
+    Unpublished events are never removed, however old; the relay still owes
+    them a send.
+    """
+    return _delete_in_chunks(outbox_events, outbox_events.c.published_at < cutoff, chunk_size, pause, None)
@@ -0,0 +1,123 @@
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import redis
+
+from worker.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PLAN = "basic"
+
+# Celery queue each plan tier's checks run on
+PLAN_QUEUES = {
+    "enterprise": "checks.enterprise",
+    "premium": "checks.premium",
+    "basic": "checks.basic",
+}
+
+# Relative share of each dispatch run an organization on the plan may claim
+PLAN_WEIGHTS = {
+    plan: float(os.getenv(f"FAIR_SHARE_WEIGHT_{plan.upper()}", weight))
+    for plan, weight in (("enterprise", "4"), ("premium", "2"), ("basic", "1"))
+}
+
+
+def queue_for_plan(plan_type: Optional[str]) -> str:
+    return PLAN_QUEUES.get(plan_type, PLAN_QUEUES[DEFAULT_PLAN])
+
+
+@dataclass
+class TenantBacklog:
+    """Checks waiting for one organization
+
+    ``pending`` are claimable; ``queued`` were already claimed and sent to
+    the plan's queue but have not started yet.
+    """
+
+    organization_id: int
+    plan_type: str
+    pending: int
+    oldest_created_at: Optional[datetime] = None
+    queued: int = 0
+
+    @property
+    def weight(self) -> float:
+        return PLAN_WEIGHTS.get(self.plan_type, PLAN_WEIGHTS[DEFAULT_PLAN])
+
+
+def fair_shares(backlogs: List[TenantBacklog], capacity: int) -> Dict[int, int]:
+    """Split ``capacity`` queued checks between organizations by plan weight
+
+    Weighted max-min fairness: each organization is entitled to capacity in
+    proportion to its plan weight, never more than it has waiting, and
+    whatever a small backlog leaves unused is shared out again among the
+    rest. ``capacity`` bounds what sits in the queues, not what one run
+    claims: checks an organization already has queued count against its
+    entitlement, and it is only granted the difference. A tenant that
+    enqueues faster than its queue drains therefore gets nothing more until
+    it has worked its queue down, and one tenant's large upload cannot take
+    more than its share while others wait.
+    """
+    allotted = {backlog.organization_id: 0 for backlog in backlogs}
+    demand = {backlog.organization_id: backlog.queued + backlog.pending for backlog in backlogs}
+    waiting = [backlog for backlog in backlogs if demand[backlog.organization_id] > 0]
+    remaining = capacity
+    while remaining > 0 and waiting:
+        total_weight = sum(backlog.weight for backlog in waiting)
+        granted = 0
+        for backlog in waiting:
+            want = demand[backlog.organization_id] - allotted[backlog.organization_id]
+            share = min(want, max(1, int(remaining * backlog.weight / total_weight)), remaining - granted)
+            allotted[backlog.organization_id] += share
+            granted += share
+            if granted >= remaining:
+                break
+        remaining -= granted
+        waiting = [b for b in waiting if allotted[b.organization_id] < demand[b.organization_id]]
+    return {
+        backlog.organization_id: max(0, allotted[backlog.organization_id] - backlog.queued)
+        for backlog in backlogs
+    }
+
+
+def record_tenant_backlog(backlogs: List[TenantBacklog], now: datetime, redis_factory=get_redis):
+    """Publish each organization's queue depth and oldest wait to Redis
+
+    Metrics live in ``tenant_metrics:{organization_id}`` hashes; failures to
+    write them never hold up dispatch.
+    """
+    try:
+        pipe = redis_factory().pipeline(transaction=False)
+        for backlog in backlogs:
+            oldest_wait = (now - backlog.oldest_created_at).total_seconds() if backlog.oldest_created_at else 0
+            pipe.hset(
+                f"tenant_metrics:{backlog.organization_id}",
+                mapping={
+                    "plan_type": backlog.plan_type,
+                    "queue_depth": backlog.pending,
+                    "queued": backlog.queued,
+                    "oldest_wait_seconds": round(oldest_wait, 3),
+                    "updated_at": int(time.time()),
+                },
+            )
+        pipe.execute()
+    except redis.RedisError:
+        logger.warning("Failed to record tenant backlog metrics", exc_info=True)
+
+
+def record_tenant_wait(organization_id: int, wait_seconds: float, redis_factory=get_redis):
+    """Add one check's time from creation to start to its tenant's totals"""
+    try:
+        pipe = redis_factory().pipeline(transaction=False)
+        key = f"tenant_metrics:{organization_id}"
+        pipe.hincrby(key, "started", 1)
+        pipe.hincrbyfloat(key, "total_wait_seconds", max(wait_seconds, 0))
+        pipe.hset(key, "last_wait_seconds", round(max(wait_seconds, 0), 3))
+        pipe.execute()
+    except redis.RedisError:
+        logger.warning("Failed to record tenant wait metrics", exc_info=True)
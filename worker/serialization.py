@@ -0,0 +1,57 @@
+import gzip
+import os
+from datetime import date, datetime
+from typing import Any
+
+import msgpack
+from kombu.serialization import register
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+SERIALIZER = "msgpack-compressed"
+CONTENT_TYPE = "application/x-msgpack-compressed"
+
+# Bodies smaller than this are not worth compressing
+COMPRESS_THRESHOLD_BYTES = int(os.getenv("TASK_COMPRESS_THRESHOLD_BYTES", "1024"))
+
+# First byte of every body says how the rest is encoded
+_PLAIN = b"\x00"
+_GZIP = b"\x01"
+_ZSTD = b"\x02"
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """msgpack ``obj``, compressing it with zstd (or gzip) above the threshold"""
+    packed = msgpack.packb(obj, use_bin_type=True, default=_default)
+    if len(packed) < COMPRESS_THRESHOLD_BYTES:
+        return _PLAIN + packed
+    if zstandard is not None:
+        return _ZSTD + zstandard.ZstdCompressor().compress(packed)
+    return _GZIP + gzip.compress(packed, compresslevel=6)
+
+
+def loads(data: bytes) -> Any:
+    marker, body = data[:1], data[1:]
+    if marker == _ZSTD:
+        if zstandard is None:
+            raise ValueError("Message is zstd-compressed but zstandard is not installed")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif marker == _GZIP:
+        body = gzip.decompress(body)
+    elif marker != _PLAIN:
+        raise ValueError(f"Unknown {SERIALIZER} encoding marker {marker!r}")
+    return msgpack.unpackb(body, raw=False)
+
+
+def register_serializer():
+    """Make ``SERIALIZER`` available to Celery's task and result settings"""
+    register(SERIALIZER, dumps, loads, content_type=CONTENT_TYPE, content_encoding="binary")
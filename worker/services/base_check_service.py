@@ -0,0 +1,44 @@
+from typing import Dict, Any, List, Optional
+
+from worker.services.provider_gateway import ProviderGateway, get_provider_gateway
+
+
+class ProviderCheckService:
+    """Common plumbing shared by the vendor check services.
+
+    Subclasses set ``api_key`` and ``api_url``; every outbound vendor call goes
+    through the process-wide ``ProviderGateway`` so connections are pooled.
+    Vendors with a bulk endpoint also set ``supports_bulk`` and implement
+    ``perform_bulk_check``, which lets the executor micro-batch their lookups.
+    """
+
+    api_key: Optional[str] = None
+    api_url: str = ""
+    supports_bulk: bool = False
+
+    def perform_bulk_check(self, candidate_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Check several candidates in one vendor call, keyed by candidate id"""
+        raise NotImplementedError(f"{type(self).__name__} has no bulk endpoint")
+
+    def __init__(self, gateway: Optional[ProviderGateway] = None):
+        self.gateway = gateway or get_provider_gateway()
+
+    def call_provider(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST ``payload`` to the vendor API and return the decoded response"""
+        response = self.gateway.request(
+            "POST",
+            self.api_url,
+            json=payload,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+        )
+        return response.json()
+
+    async def acall_provider(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of ``call_provider``"""
+        response = await self.gateway.arequest(
+            "POST",
+            self.api_url,
+            json=payload,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+        )
+        return response.json()
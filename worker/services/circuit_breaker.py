@@ -0,0 +1,169 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+import httpx
+import redis
+
+from worker.models import CheckType
+from worker.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Decides whether a call may go ahead. Returns 0 to allow it, otherwise the
+# milliseconds until the circuit lets the next probe through. An open circuit
+# turns half-open once ``open_ms`` has passed; a half-open circuit admits
+# ``max_probes`` calls, and re-admits more if those probes never report back.
+ALLOW_CALL = """
+local now = tonumber(ARGV[1])
+local open_ms = tonumber(ARGV[2])
+local max_probes = tonumber(ARGV[3])
+local state = redis.call("hget", KEYS[1], "state") or "closed"
+if state == "closed" then
+    return 0
+end
+local since = now - tonumber(redis.call("hget", KEYS[1], "changed_at") or now)
+if state == "open" then
+    if since < open_ms then
+        return open_ms - since
+    end
+    redis.call("hset", KEYS[1], "state", "half_open", "changed_at", now, "probes", 0)
+elseif since >= open_ms then
+    redis.call("hset", KEYS[1], "changed_at", now, "probes", 0)
+end
+if redis.call("hincrby", KEYS[1], "probes", 1) > max_probes then
+    return math.max(open_ms - since, 1000)
+end
+return 0
+"""
+
+# Records how a call went. Failures are counted over a rolling window and
+# open the circuit at ``threshold``; a failed probe re-opens it straight away
+# and a successful one closes it.
+RECORD_CALL = """
+local now = tonumber(ARGV[2])
+local state = redis.call("hget", KEYS[1], "state") or "closed"
+if ARGV[1] == "success" then
+    if state == "half_open" then
+        redis.call("del", KEYS[1])
+    end
+    return state
+end
+if state == "half_open" then
+    redis.call("hset", KEYS[1], "state", "open", "changed_at", now)
+    return "open"
+end
+if state == "open" then
+    return state
+end
+local window_start = tonumber(redis.call("hget", KEYS[1], "window_start") or 0)
+if now - window_start > tonumber(ARGV[4]) then
+    redis.call("hset", KEYS[1], "window_start", now, "failures", 0)
+end
+if redis.call("hincrby", KEYS[1], "failures", 1) >= tonumber(ARGV[3]) then
+    redis.call("hset", KEYS[1], "state", "open", "changed_at", now, "failures", 0)
+    return "open"
+end
+return state
+"""
+
+
+class CircuitOpen(Exception):
+    """The provider's circuit is open; calls fail fast until it is probed again"""
+
+    def __init__(self, check_type: CheckType, retry_after: float):
+        super().__init__(f"{check_type.value} provider circuit open; retry in {retry_after:.1f}s")
+        self.check_type = check_type
+        self.retry_after = retry_after
+
+
+def is_provider_failure(exc: Exception) -> bool:
+    """Errors that say the provider itself is unhealthy, not the request"""
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return False
+
+
+class CircuitBreaker:
+    """Per-provider circuit breakers whose state is shared through Redis.
+
+    A provider's circuit opens after ``failure_threshold`` provider failures
+    (transport errors, timeouts and 5xx answers) within ``failure_window``
+    seconds. While it is open, ``guard`` raises ``CircuitOpen`` without
+    calling out, so no worker slot waits on a provider that is down. After
+    ``open_seconds`` the circuit goes half-open and lets ``half_open_probes``
+    calls through: a success closes it again, a failure re-opens it. Every
+    worker sees the same state. Redis failures leave the circuit closed.
+    """
+
+    def __init__(
+        self,
+        redis_factory: Callable[[], redis.Redis],
+        failure_threshold: int = 5,
+        failure_window: float = 60.0,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+    ):
+        self.redis_factory = redis_factory
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+    @contextmanager
+    def guard(self, check_type: CheckType) -> Iterator[None]:
+        """Fail fast if ``check_type``'s circuit is open, else record the call"""
+        self._allow(check_type)
+        try:
+            yield
+        except Exception as exc:
+            if is_provider_failure(exc):
+                self._record(check_type, "failure")
+            raise
+        else:
+            self._record(check_type, "success")
+
+    def _allow(self, check_type: CheckType):
+        try:
+            wait_ms = self.redis_factory().eval(
+                ALLOW_CALL, 1, self._key(check_type),
+                self._now_ms(), int(self.open_seconds * 1000), self.half_open_probes,
+            )
+        except redis.RedisError:
+            logger.warning("Circuit breaker unavailable for %s; allowing call", check_type.value, exc_info=True)
+            return
+        if wait_ms:
+            raise CircuitOpen(check_type, wait_ms / 1000)
+
+    def _record(self, check_type: CheckType, outcome: str):
+        try:
+            state = self.redis_factory().eval(
+                RECORD_CALL, 1, self._key(check_type),
+                outcome, self._now_ms(), self.failure_threshold, int(self.failure_window * 1000),
+            )
+        except redis.RedisError:
+            logger.warning("Failed to record %s call outcome", check_type.value, exc_info=True)
+            return
+        if outcome == "failure" and state in ("open", b"open"):
+            logger.warning("%s provider circuit is open", check_type.value)
+
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+
+    @staticmethod
+    def _key(check_type: CheckType) -> str:
+        return f"circuit:{check_type.value}"
+
+
+provider_breaker = CircuitBreaker(
+    get_redis,
+    failure_threshold=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")),
+    failure_window=float(os.getenv("CIRCUIT_FAILURE_WINDOW_SECONDS", "60")),
+    open_seconds=float(os.getenv("CIRCUIT_OPEN_SECONDS", "30")),
+    half_open_probes=int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "1")),
+)
@@ -1,10 +1,15 @@
-import httpx
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
+from worker.services.base_check_service import ProviderCheckService
+from worker.services.provider_gateway import ProviderGateway
 
-class CriminalCheckService:
-    def __init__(self):
+
+class CriminalCheckService(ProviderCheckService):
+    supports_bulk = True
+
+    def __init__(self, gateway: Optional[ProviderGateway] = None):
+        super().__init__(gateway)
         self.api_key = os.getenv("CRIMINAL_CHECK_API_KEY")
         self.api_url = "https://api.criminalcheck.com/v1/check"  # Example API
 
@@ -12,6 +17,7 @@ class CriminalCheckService:
         """Perform criminal background check"""
         # This is a mock implementation
         # In production, you would integrate with real criminal check APIs
+        # through self.call_provider(), which uses the shared provider gateway
         
         try:
             # Mock API call
@@ -38,3 +44,10 @@ class CriminalCheckService:
                 "error": str(e),
                 "details": None
             }
+
+    def perform_bulk_check(self, candidate_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Perform criminal checks for several candidates at once"""
+        # This is a mock implementation
+        # In production this is one self.call_provider() to the vendor's bulk
+        # endpoint, with the answers matched back up by candidate id
+        return {candidate_id: self.perform_check(candidate_id) for candidate_id in candidate_ids}
@@ -0,0 +1,102 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Optional
+
+from worker.models import CheckType
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling window of recent provider call latencies, per check type"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[CheckType, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, check_type: CheckType, seconds: float):
+        with self._lock:
+            self._samples.setdefault(check_type, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, check_type: CheckType, pct: float, min_samples: int) -> Optional[float]:
+        """The ``pct`` percentile latency, or None with too few samples"""
+        with self._lock:
+            samples = sorted(self._samples.get(check_type, ()))
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+class Hedger:
+    """Sends a second, duplicate provider call when the first one runs slow.
+
+    If the first call has not answered within the provider's recent p95
+    latency, an identical call is started and whichever finishes first is
+    used. That bounds the tail latency of a check without doubling the load:
+    only about 5% of calls get hedged. Hedging starts only once
+    ``min_samples`` latencies have been seen. A hedge that the rate limiter
+    throttles is simply dropped. The slower call is not cancelled, but its
+    answer is ignored.
+    """
+
+    def __init__(self, max_workers: int = 16, min_samples: int = 20, percentile: float = 95.0):
+        self.max_workers = max_workers
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.latencies = LatencyTracker()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        # Pool threads do not survive a fork, so each worker process builds its own
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hedge")
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def call(self, check_type: CheckType, fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        hedge_after = self.latencies.percentile(check_type, self.percentile, self.min_samples)
+        pool = self._executor()
+        primary = pool.submit(self._timed, check_type, fn)
+        if hedge_after is None:
+            return primary.result()
+
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        logger.info("Hedging slow %s provider call after %.2fs", check_type.value, hedge_after)
+        hedge = pool.submit(self._timed, check_type, fn)
+        return self._first_answer(primary, hedge)
+
+    @staticmethod
+    def _first_answer(primary: Future, hedge: Future) -> Dict[str, Any]:
+        """The first successful answer; the primary's error if neither succeeds"""
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+        # A throttled or failed hedge says nothing about the primary's answer
+        return primary.result()
+
+    def _timed(self, check_type: CheckType, fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        started = time.monotonic()
+        result = fn()
+        self.latencies.observe(check_type, time.monotonic() - started)
+        return result
+
+
+hedger = Hedger(
+    max_workers=int(os.getenv("HEDGE_MAX_WORKERS", "16")),
+    min_samples=int(os.getenv("HEDGE_MIN_SAMPLES", "20")),
+    percentile=float(os.getenv("HEDGE_PERCENTILE", "95")),
+)
@@ -1,10 +1,15 @@
-import httpx
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
+from worker.services.base_check_service import ProviderCheckService
+from worker.services.provider_gateway import ProviderGateway
 
-class IdentityCheckService:
-    def __init__(self):
+
+class IdentityCheckService(ProviderCheckService):
+    supports_bulk = True
+
+    def __init__(self, gateway: Optional[ProviderGateway] = None):
+        super().__init__(gateway)
         self.api_key = os.getenv("IDENTITY_VERIFICATION_API_KEY")
         self.api_url = "https://api.identityverify.com/v1/verify"  # Example API
 
@@ -12,6 +17,7 @@ class IdentityCheckService:
         """Perform identity verification check"""
         # This is a mock implementation
         # In production, you would integrate with real identity verification APIs
+        # through self.call_provider(), which uses the shared provider gateway
         
         try:
             # Mock API call
@@ -40,3 +46,10 @@ class IdentityCheckService:
                 "error": str(e),
                 "details": None
             }
+
+    def perform_bulk_check(self, candidate_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Perform identity checks for several candidates at once"""
+        # This is a mock implementation
+        # In production this is one self.call_provider() to the vendor's bulk
+        # endpoint, with the answers matched back up by candidate id
+        return {candidate_id: self.perform_check(candidate_id) for candidate_id in candidate_ids}
@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, List
+
+import redis
+
+from worker.models import CheckType
+from worker.redis_client import get_redis
+from worker.services.base_check_service import ProviderCheckService
+from worker.services.single_flight import RELEASE_LOCK
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatchError(Exception):
+    """The bulk call that carried this lookup failed"""
+
+
+class MicroBatcher:
+    """Groups single-candidate lookups from every worker process into bulk calls.
+
+    Each lookup is queued in Redis under its check type. Whichever caller
+    takes the type's leader lock collects the queue for up to ``max_wait``
+    seconds or ``max_items`` lookups, makes one ``perform_bulk_check`` call
+    and hands every caller its own answer on a per-lookup result key. The
+    leader keeps draining batches until its own lookup has been answered.
+    Lookups the bulk answer leaves out, lookups nobody picked up within
+    ``result_timeout`` and any Redis failure all fall back to a single
+    ``perform_check``.
+    """
+
+    def __init__(
+        self,
+        redis_factory: Callable[[], redis.Redis],
+        max_items: int = 50,
+        max_wait: float = 0.05,
+        result_timeout: float = 30.0,
+        result_ttl: float = 60.0,
+    ):
+        self.redis_factory = redis_factory
+        self.max_items = max_items
+        self.max_wait = max_wait
+        self.result_timeout = result_timeout
+        self.result_ttl = result_ttl
+
+    def perform(self, check_type: CheckType, service: ProviderCheckService, candidate_id: int) -> Dict[str, Any]:
+        lookup_id = uuid.uuid4().hex
+        item = json.dumps({"id": lookup_id, "candidate_id": candidate_id})
+        try:
+            r = self.redis_factory()
+            r.rpush(self._queue_key(check_type), item)
+            answer = self._await_answer(r, check_type, service, lookup_id, item)
+        except redis.RedisError:
+            logger.warning("Micro-batching unavailable for %s; looking up singly", check_type.value, exc_info=True)
+            return service.perform_check(candidate_id)
+
+        if answer is None or answer.get("fallback"):
+            return service.perform_check(candidate_id)
+        if not answer["ok"]:
+            raise MicroBatchError(answer["error"])
+        return answer["result"]
+
+    def _await_answer(
+        self,
+        r: redis.Redis,
+        check_type: CheckType,
+        service: ProviderCheckService,
+        lookup_id: str,
+        item: str,
+    ):
+        deadline = time.monotonic() + self.result_timeout
+        while time.monotonic() < deadline:
+            token = uuid.uuid4().hex
+            lock_ms = int((self.result_timeout + self.max_wait) * 1000)
+            if r.set(self._leader_key(check_type), token, nx=True, px=lock_ms):
+                try:
+                    self._drain(r, check_type, service, lookup_id, deadline)
+                finally:
+                    r.eval(RELEASE_LOCK, 1, self._leader_key(check_type), token)
+
+            remaining = deadline - time.monotonic()
+            popped = r.blpop([self._result_key(lookup_id)], timeout=max(min(self.max_wait * 4, remaining), 0.01))
+            if popped is not None:
+                return json.loads(popped[1])
+
+        # Nobody answered in time; withdraw the lookup unless a leader already took it
+        if r.lrem(self._queue_key(check_type), 1, item):
+            return None
+        popped = r.blpop([self._result_key(lookup_id)], timeout=1)
+        return json.loads(popped[1]) if popped is not None else None
+
+    def _drain(
+        self,
+        r: redis.Redis,
+        check_type: CheckType,
+        service: ProviderCheckService,
+        lookup_id: str,
+        deadline: float,
+    ):
+        queue_key = self._queue_key(check_type)
+        while time.monotonic() < deadline:
+            collect_until = time.monotonic() + self.max_wait
+            while r.llen(queue_key) < self.max_items and time.monotonic() < collect_until:
+                time.sleep(min(0.005, self.max_wait))
+
+            pipe = r.pipeline()
+            pipe.lrange(queue_key, 0, self.max_items - 1)
+            pipe.ltrim(queue_key, self.max_items, -1)
+            items, _ = pipe.execute()
+            if not items:
+                return
+            self._run_batch(r, service, [json.loads(raw) for raw in items])
+            if r.llen(self._result_key(lookup_id)):
+                return
+
+    def _run_batch(self, r: redis.Redis, service: ProviderCheckService, items: List[Dict[str, Any]]):
+        candidate_ids = sorted({item["candidate_id"] for item in items})
+        try:
+            answers = service.perform_bulk_check(candidate_ids)
+            messages = {
+                item["id"]: (
+                    {"ok": True, "result": answers[item["candidate_id"]]}
+                    if item["candidate_id"] in answers
+                    else {"ok": False, "fallback": True}
+                )
+                for item in items
+            }
+        except Exception as exc:
+            logger.warning("Bulk %s lookup of %d candidates failed", type(service).__name__, len(items), exc_info=True)
+            messages = {item["id"]: {"ok": False, "error": str(exc)} for item in items}
+
+        pipe = r.pipeline(transaction=False)
+        for lookup_id, message in messages.items():
+            pipe.rpush(self._result_key(lookup_id), json.dumps(message))
+            pipe.pexpire(self._result_key(lookup_id), int(self.result_ttl * 1000))
+        pipe.execute()
+
+    @staticmethod
+    def _queue_key(check_type: CheckType) -> str:
+        return f"micro_batch:{check_type.value}:queue"
+
+    @staticmethod
+    def _leader_key(check_type: CheckType) -> str:
+        return f"micro_batch:{check_type.value}:leader"
+
+    @staticmethod
+    def _result_key(lookup_id: str) -> str:
+        return f"micro_batch:result:{lookup_id}"
+
+
+micro_batcher = MicroBatcher(
+    get_redis,
+    max_items=int(os.getenv("MICRO_BATCH_MAX_ITEMS", "50")),
+    max_wait=float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "50")) / 1000,
+    result_timeout=float(os.getenv("MICRO_BATCH_RESULT_TIMEOUT_SECONDS", "30")),
+)
@@ -0,0 +1,132 @@
+import asyncio
+import httpx
+import logging
+import os
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+from celery.signals import worker_process_init, worker_process_shutdown
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderGateway:
+    """Process-wide owner of the pooled HTTP clients used by the check services.
+
+    One sync and one async ``httpx`` client is kept per vendor host, so the
+    connection limits apply per host and connections (and their TLS sessions)
+    are kept alive and reused across tasks instead of being rebuilt per call.
+    """
+
+    def __init__(self):
+        self.limits = httpx.Limits(
+            max_connections=int(os.getenv("PROVIDER_MAX_CONNECTIONS_PER_HOST", "20")),
+            max_keepalive_connections=int(os.getenv("PROVIDER_MAX_KEEPALIVE_CONNECTIONS", "10")),
+            keepalive_expiry=float(os.getenv("PROVIDER_KEEPALIVE_EXPIRY", "60")),
+        )
+        self.timeout = httpx.Timeout(
+            float(os.getenv("PROVIDER_TIMEOUT", "10")),
+            connect=float(os.getenv("PROVIDER_CONNECT_TIMEOUT", "5")),
+        )
+        self.http2 = os.getenv("PROVIDER_HTTP2", "true").lower() == "true"
+        self._clients: Dict[str, httpx.Client] = {}
+        self._async_clients: Dict[str, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def client(self, url: str) -> httpx.Client:
+        """Return the pooled sync client for the host serving ``url``"""
+        key = self._host_key(url)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = httpx.Client(limits=self.limits, timeout=self.timeout, http2=self.http2)
+                    self._clients[key] = client
+        return client
+
+    def async_client(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled async client for the host serving ``url``"""
+        key = self._host_key(url)
+        client = self._async_clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._async_clients.get(key)
+                if client is None:
+                    client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=self.http2)
+                    self._async_clients[key] = client
+        return client
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        response = self.client(url).request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def arequest(self, method: str, url: str, **kwargs) -> httpx.Response:
+        response = await self.async_client(url).request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def reset(self):
+        """Forget the pooled clients without closing their sockets"""
+        with self._lock:
+            self._clients = {}
+            self._async_clients = {}
+
+    def close(self):
+        """Close every pooled client; new ones are created on next use"""
+        with self._lock:
+            clients, self._clients = self._clients, {}
+            async_clients, self._async_clients = self._async_clients, {}
+        for client in clients.values():
+            client.close()
+        for client in async_clients.values():
+            self._close_async(client)
+
+    @staticmethod
+    def _close_async(client: httpx.AsyncClient):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        try:
+            if loop is None:
+                asyncio.run(client.aclose())
+            else:
+                # Called from async code: close on that loop rather than blocking it
+                loop.create_task(client.aclose())
+        except Exception:
+            logger.warning("Failed to close async provider client", exc_info=True)
+
+
+_gateway: Optional[ProviderGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_provider_gateway() -> ProviderGateway:
+    """Return the gateway shared by every check service in this process"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = ProviderGateway()
+    return _gateway
+
+
+@worker_process_init.connect
+def _reset_gateway_after_fork(**kwargs: Any):
+    # Pooled sockets must never be shared between forked worker processes
+    if _gateway is not None:
+        _gateway.reset()
+
+
+@worker_process_shutdown.connect
+def _close_gateway(**kwargs: Any):
+    if _gateway is not None:
+        _gateway.close()
@@ -0,0 +1,203 @@
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+import httpx
+import redis
+
+from worker.models import CheckType
+from worker.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Refills the bucket for the time elapsed and takes one token if available.
+# Returns 0 when a token was taken, otherwise the milliseconds until one is.
+TAKE_TOKEN = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call("hmget", KEYS[1], "tokens", "ts")
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call("hset", KEYS[1], "tokens", tokens, "ts", now)
+redis.call("pexpire", KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return wait
+"""
+
+# Takes a concurrency slot if fewer than the current AIMD limit are held.
+# Slots are scored by expiry so ones leaked by a dead worker age out.
+TAKE_SLOT = """
+local limit = tonumber(redis.call("get", KEYS[2]) or ARGV[4])
+redis.call("zremrangebyscore", KEYS[1], "-inf", ARGV[2])
+if redis.call("zcard", KEYS[1]) < math.floor(limit) then
+    redis.call("zadd", KEYS[1], ARGV[3], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+# Additive increase / multiplicative decrease of the concurrency limit
+ADJUST_LIMIT = """
+local limit = tonumber(redis.call("get", KEYS[1]) or ARGV[3])
+if ARGV[1] == "increase" then
+    limit = math.min(tonumber(ARGV[3]), limit + 1 / limit)
+else
+    limit = math.max(tonumber(ARGV[2]), limit * tonumber(ARGV[4]))
+end
+redis.call("set", KEYS[1], limit)
+return tostring(limit)
+"""
+
+
+class ProviderThrottled(Exception):
+    """No token or concurrency slot is free for the provider right now"""
+
+    def __init__(self, check_type: CheckType, retry_after: float):
+        super().__init__(f"{check_type.value} provider throttled; retry in {retry_after:.1f}s")
+        self.check_type = check_type
+        self.retry_after = retry_after
+
+
+class ProviderLimiter:
+    """Cluster-wide throttling of calls to each check provider.
+
+    Every provider has a Redis token bucket (``rate`` calls per second, up
+    to ``burst``) shared by all workers, plus an AIMD concurrency limit: the
+    number of calls in flight grows by roughly one per round of successful
+    calls and is cut by ``decrease_factor`` on a 429, a 5xx, a timeout or a
+    call slower than ``latency_threshold``. When either limit is hit,
+    ``slot`` raises ``ProviderThrottled`` straight away so the task can be
+    deferred instead of sleeping in a worker slot. Redis failures fail open.
+    """
+
+    def __init__(
+        self,
+        redis_factory: Callable[[], redis.Redis],
+        rates: Dict[CheckType, float],
+        bursts: Dict[CheckType, int],
+        max_concurrency: Dict[CheckType, int],
+        min_concurrency: int = 1,
+        decrease_factor: float = 0.5,
+        latency_threshold: float = 5.0,
+        slot_ttl: float = 300.0,
+    ):
+        self.redis_factory = redis_factory
+        self.rates = rates
+        self.bursts = bursts
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold
+        self.slot_ttl = slot_ttl
+
+    @contextmanager
+    def slot(self, check_type: CheckType) -> Iterator[None]:
+        """Hold a token and a concurrency slot for one upstream call"""
+        token = self._acquire(check_type)
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as exc:
+            if self._is_overload(exc):
+                self._adjust(check_type, "decrease")
+            raise
+        else:
+            slow = time.monotonic() - started > self.latency_threshold
+            self._adjust(check_type, "decrease" if slow else "increase")
+        finally:
+            self._release(check_type, token)
+
+    def _acquire(self, check_type: CheckType) -> Optional[str]:
+        try:
+            r = self.redis_factory()
+            now_ms = int(time.time() * 1000)
+            # The slot is taken first: a token spent on a call that then
+            # found no free slot would be lost to the bucket
+            token = uuid.uuid4().hex
+            taken = r.eval(
+                TAKE_SLOT, 2, self._slots_key(check_type), self._limit_key(check_type),
+                token, now_ms, now_ms + int(self.slot_ttl * 1000), self.max_concurrency[check_type],
+            )
+            if not taken:
+                # A slot frees up once an in-flight call finishes; check back soon
+                raise ProviderThrottled(check_type, 1.0)
+
+            wait_ms = r.eval(
+                TAKE_TOKEN, 1, self._bucket_key(check_type),
+                self.rates[check_type], self.bursts[check_type], now_ms,
+            )
+        except redis.RedisError:
+            logger.warning("Rate limiter unavailable for %s; allowing call", check_type.value, exc_info=True)
+            return None
+        if wait_ms:
+            self._release(check_type, token)
+            raise ProviderThrottled(check_type, wait_ms / 1000)
+        return token
+
+    def _release(self, check_type: CheckType, token: Optional[str]):
+        if token is None:
+            return
+        try:
+            self.redis_factory().zrem(self._slots_key(check_type), token)
+        except redis.RedisError:
+            logger.warning("Failed to release %s concurrency slot", check_type.value, exc_info=True)
+
+    def _adjust(self, check_type: CheckType, direction: str):
+        try:
+            self.redis_factory().eval(
+                ADJUST_LIMIT, 1, self._limit_key(check_type),
+                direction, self.min_concurrency, self.max_concurrency[check_type], self.decrease_factor,
+            )
+        except redis.RedisError:
+            logger.warning("Failed to adjust %s concurrency limit", check_type.value, exc_info=True)
+
+    @staticmethod
+    def _is_overload(exc: Exception) -> bool:
+        if isinstance(exc, httpx.TimeoutException):
+            return True
+        if isinstance(exc, httpx.HTTPStatusError):
+            status = exc.response.status_code
+            return status == 429 or status >= 500
+        return False
+
+    @staticmethod
+    def _bucket_key(check_type: CheckType) -> str:
+        return f"provider_limit:{check_type.value}:bucket"
+
+    @staticmethod
+    def _slots_key(check_type: CheckType) -> str:
+        return f"provider_limit:{check_type.value}:slots"
+
+    @staticmethod
+    def _limit_key(check_type: CheckType) -> str:
+        return f"provider_limit:{check_type.value}:concurrency"
+
+
+provider_limiter = ProviderLimiter(
+    get_redis,
+    rates={
+        check_type: float(os.getenv(f"RATE_LIMIT_{check_type.name}_PER_SECOND", "10"))
+        for check_type in CheckType
+    },
+    bursts={
+        check_type: int(os.getenv(f"RATE_LIMIT_{check_type.name}_BURST", "20"))
+        for check_type in CheckType
+    },
+    max_concurrency={
+        check_type: int(os.getenv(f"CONCURRENCY_{check_type.name}_MAX", "20"))
+        for check_type in CheckType
+    },
+    min_concurrency=int(os.getenv("CONCURRENCY_MIN", "1")),
+    decrease_factor=float(os.getenv("CONCURRENCY_DECREASE_FACTOR", "0.5")),
+    latency_threshold=float(os.getenv("CONCURRENCY_LATENCY_THRESHOLD_SECONDS", "5")),
+)
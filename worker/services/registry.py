@@ -0,0 +1,76 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, List, Optional
+
+from worker.models import BackgroundCheck, CheckType, ResultStatus
+from worker.services.base_check_service import ProviderCheckService
+from worker.services.criminal_check_service import CriminalCheckService
+from worker.services.education_check_service import EducationCheckService
+from worker.services.employment_check_service import EmploymentCheckService
+from worker.services.identity_check_service import IdentityCheckService
+from worker.services.social_media_check_service import SocialMediaCheckService
+
+
+@dataclass
+class CheckProvider:
+    """Everything the check executor needs to know about one check type"""
+
+    check_type: CheckType
+    service_factory: Callable[[], ProviderCheckService]
+    # Key of the service result that decides PASS vs FAIL
+    outcome_field: str
+    # BackgroundCheck column that enables this check type
+    enabled_flag: str
+    _service: Optional[ProviderCheckService] = field(default=None, init=False, repr=False)
+
+    @property
+    def service(self) -> ProviderCheckService:
+        # Built once per process so every call shares the pooled provider gateway
+        if self._service is None:
+            self._service = self.service_factory()
+        return self._service
+
+    def outcome(self, result: Dict[str, Any]) -> ResultStatus:
+        return ResultStatus.PASS if result[self.outcome_field] else ResultStatus.FAIL
+
+
+_providers: Dict[CheckType, CheckProvider] = {}
+
+
+def register_provider(
+    check_type: CheckType,
+    service_factory: Callable[[], ProviderCheckService],
+    outcome_field: str,
+    enabled_flag: str,
+) -> CheckProvider:
+    """Register the service that performs ``check_type`` checks"""
+    provider = CheckProvider(
+        check_type=check_type,
+        service_factory=service_factory,
+        outcome_field=outcome_field,
+        enabled_flag=enabled_flag,
+    )
+    _providers[check_type] = provider
+    return provider
+
+
+def get_provider(check_type: CheckType) -> CheckProvider:
+    try:
+        return _providers[CheckType(check_type)]
+    except KeyError:
+        raise ValueError(f"No provider registered for check type {check_type!r}")
+
+
+def enabled_check_types(background_check: BackgroundCheck) -> List[CheckType]:
+    """Check types switched on for ``background_check``, in registration order"""
+    return [
+        provider.check_type
+        for provider in _providers.values()
+        if getattr(background_check, provider.enabled_flag)
+    ]
+
+
+register_provider(CheckType.CRIMINAL, CriminalCheckService, "passed", "criminal_check")
+register_provider(CheckType.EDUCATION, EducationCheckService, "verified", "education_verification")
+register_provider(CheckType.EMPLOYMENT, EmploymentCheckService, "verified", "employment_verification")
+register_provider(CheckType.IDENTITY, IdentityCheckService, "verified", "identity_verification")
+register_provider(CheckType.SOCIAL_MEDIA, SocialMediaCheckService, "passed", "social_media_check")
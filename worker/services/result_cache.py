@@ -0,0 +1,197 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional, Tuple
+
+import redis
+
+from worker.models import Candidate, CheckType
+from worker.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Seconds a provider answer may be reused for; 0 disables caching for the type
+DEFAULT_TTLS = {
+    CheckType.CRIMINAL: 24 * 3600,
+    CheckType.EDUCATION: 30 * 24 * 3600,
+    CheckType.EMPLOYMENT: 7 * 24 * 3600,
+    CheckType.IDENTITY: 30 * 24 * 3600,
+    CheckType.SOCIAL_MEDIA: 24 * 3600,
+}
+
+# Secret used to key candidate fingerprints; caching is off without it
+FINGERPRINT_KEY = os.getenv("CHECK_CACHE_FINGERPRINT_KEY", "")
+
+
+def _normalize(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    value = re.sub(r"[^\w\s]", " ", value.lower())
+    return " ".join(value.split())
+
+
+def candidate_fingerprint(candidate: Candidate, key: str = FINGERPRINT_KEY) -> Optional[str]:
+    """Keyed hash of the identity fields a provider answer depends on
+
+    Two candidate rows describing the same person (e.g. re-screens or one
+    person applying to two roles) map to the same fingerprint. The fields
+    are combined with an HMAC under ``key`` so the small SSN space cannot
+    be brute-forced back out of the cache keys. Returns None when no key is
+    configured, or when there is neither a date of birth nor an SSN, since a
+    name and address alone are not enough to tell people apart.
+    """
+    ssn_digits = re.sub(r"\D", "", candidate.ssn or "")
+    if not key or (not ssn_digits and not candidate.date_of_birth):
+        return None
+    parts = [
+        _normalize(candidate.first_name),
+        _normalize(candidate.last_name),
+        candidate.date_of_birth.date().isoformat() if candidate.date_of_birth else "",
+        ssn_digits,
+        _normalize(candidate.address),
+    ]
+    return hmac.new(key.encode(), "|".join(parts).encode(), hashlib.sha256).hexdigest()
+
+
+class ResultCache:
+    """Two-tier cache of provider answers: an in-process LRU in front of Redis.
+
+    Entries are keyed by check type and candidate fingerprint and expire
+    after that check type's TTL, counted from when the provider answered.
+    Hit/miss counters are kept per process in ``stats`` and added to the
+    ``check_cache:stats`` Redis hash at most every ``stats_flush_interval``
+    seconds, so memory hits never wait on Redis. Redis failures are logged
+    and treated as misses.
+    """
+
+    def __init__(
+        self,
+        redis_factory: Callable[[], redis.Redis],
+        ttls: Dict[CheckType, int],
+        local_max_entries: int = 10000,
+        stats_flush_interval: float = 10.0,
+    ):
+        self.redis_factory = redis_factory
+        self.ttls = ttls
+        self.local_max_entries = local_max_entries
+        self.stats_flush_interval = stats_flush_interval
+        self.stats: Dict[str, int] = {}
+        self._unflushed: Dict[str, int] = {}
+        self._last_flush = time.monotonic()
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def enabled(self, check_type: CheckType) -> bool:
+        return self.ttls.get(check_type, 0) > 0
+
+    @staticmethod
+    def _key(check_type: CheckType, fingerprint: str) -> str:
+        return f"check_cache:{check_type.value}:{fingerprint}"
+
+    def get(self, check_type: CheckType, fingerprint: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        """Return ``(entry, tier)`` for a cached answer, or None on a miss"""
+        key = self._key(check_type, fingerprint)
+
+        entry = self._recall(key)
+        if entry is not None:
+            self._record(check_type, "hit", "memory")
+            return entry, "memory"
+
+        try:
+            raw = self.redis_factory().get(key)
+        except redis.RedisError:
+            logger.warning("Result cache read failed for %s", key, exc_info=True)
+            raw = None
+
+        entry = json.loads(raw) if raw is not None else None
+        remaining = self._remaining_ttl(check_type, entry) if entry is not None else 0
+        if remaining <= 0:
+            self._record(check_type, "miss")
+            return None
+
+        # The local copy expires together with the Redis one
+        self._remember(key, entry, remaining)
+        self._record(check_type, "hit", "redis")
+        return entry, "redis"
+
+    def set(self, check_type: CheckType, fingerprint: str, result: Dict[str, Any]):
+        ttl = self.ttls.get(check_type, 0)
+        if ttl <= 0:
+            return
+        key = self._key(check_type, fingerprint)
+        entry = {"result": result, "cached_at": datetime.utcnow().isoformat()}
+        self._remember(key, entry, ttl)
+        try:
+            self.redis_factory().set(key, json.dumps(entry), ex=ttl)
+        except redis.RedisError:
+            logger.warning("Result cache write failed for %s", key, exc_info=True)
+
+    def _remaining_ttl(self, check_type: CheckType, entry: Dict[str, Any]) -> float:
+        age = (datetime.utcnow() - datetime.fromisoformat(entry["cached_at"])).total_seconds()
+        return self.ttls.get(check_type, 0) - age
+
+    def _recall(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            local = self._local.get(key)
+            if local is None:
+                return None
+            expires_at, entry = local
+            if expires_at <= time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry
+
+    def _remember(self, key: str, entry: Dict[str, Any], ttl: float):
+        with self._lock:
+            self._local[key] = (time.monotonic() + ttl, entry)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def _record(self, check_type: CheckType, outcome: str, tier: Optional[str] = None):
+        field = f"{check_type.value}:{outcome}" + (f":{tier}" if tier else "")
+        with self._lock:
+            self.stats[field] = self.stats.get(field, 0) + 1
+            self._unflushed[field] = self._unflushed.get(field, 0) + 1
+            if time.monotonic() - self._last_flush < self.stats_flush_interval:
+                return
+            pending, self._unflushed = self._unflushed, {}
+            self._last_flush = time.monotonic()
+        self._flush_stats(pending)
+
+    def flush_stats(self):
+        """Push the counters gathered since the last flush to Redis"""
+        with self._lock:
+            pending, self._unflushed = self._unflushed, {}
+            self._last_flush = time.monotonic()
+        self._flush_stats(pending)
+
+    def _flush_stats(self, pending: Dict[str, int]):
+        if not pending:
+            return
+        try:
+            pipe = self.redis_factory().pipeline(transaction=False)
+            for field, count in pending.items():
+                pipe.hincrby("check_cache:stats", field, count)
+            pipe.execute()
+        except redis.RedisError:
+            logger.warning("Result cache stats flush failed", exc_info=True)
+
+
+result_cache = ResultCache(
+    get_redis,
+    ttls={
+        check_type: int(os.getenv(f"CHECK_CACHE_TTL_{check_type.name}", str(ttl)))
+        for check_type, ttl in DEFAULT_TTLS.items()
+    },
+    local_max_entries=int(os.getenv("CHECK_CACHE_LOCAL_MAX_ENTRIES", "10000")),
+    stats_flush_interval=float(os.getenv("CHECK_CACHE_STATS_FLUSH_SECONDS", "10")),
+)
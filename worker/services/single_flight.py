@@ -0,0 +1,173 @@
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Callable, Dict, Any, Optional, Tuple, Type
+
+import redis
+
+from worker.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Deletes the lock only if we still own it
+RELEASE_LOCK = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlightError(Exception):
+    """The leader's upstream call failed; raised in every waiter"""
+
+
+class SingleFlight:
+    """Collapses concurrent identical provider calls across worker processes.
+
+    The first caller for a key takes a Redis lock and makes the upstream
+    call; it then stores the answer under a short-lived result key and
+    publishes it, both scoped to its lock token. Callers that find the lock
+    taken subscribe and wait (at most ``wait_timeout`` seconds) for that
+    answer instead of calling the provider themselves. If the leader disappears or the wait runs out, the
+    waiter makes the call itself. Redis failures fall back to calling
+    directly, so coalescing never blocks a check.
+    """
+
+    def __init__(
+        self,
+        redis_factory: Callable[[], redis.Redis],
+        lock_ttl: float = 60.0,
+        wait_timeout: float = 30.0,
+        result_ttl: float = 10.0,
+    ):
+        self.redis_factory = redis_factory
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.result_ttl = result_ttl
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Dict[str, Any]],
+        private_errors: Tuple[Type[Exception], ...] = (),
+    ) -> Dict[str, Any]:
+        """Run ``fn`` once for everyone asking for ``key`` at the same time
+
+        Exceptions of the ``private_errors`` types are raised in the leader
+        only; waiters see the leader go away and try to lead themselves.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            token = uuid.uuid4().hex
+            try:
+                r = self.redis_factory()
+                acquired = r.set(self._lock_key(key), token, nx=True, px=int(self.lock_ttl * 1000))
+                leader = None if acquired else r.get(self._lock_key(key))
+            except redis.RedisError:
+                logger.warning("Single-flight unavailable for %s; calling provider directly", key, exc_info=True)
+                return fn()
+
+            if acquired:
+                return self._lead(key, token, fn, private_errors)
+            if leader is None:
+                # The lock was released between our SET and GET; try again
+                continue
+
+            try:
+                published = self._wait(key, leader.decode(), deadline)
+            except redis.RedisError:
+                logger.warning("Single-flight wait failed for %s; calling provider directly", key, exc_info=True)
+                return fn()
+            if published is not None:
+                return self._unpack(published)
+            if time.monotonic() >= deadline:
+                logger.info("Single-flight wait for %s timed out; calling provider directly", key)
+                return fn()
+            # The leader went away without answering; try to take over
+
+    def _lead(
+        self,
+        key: str,
+        token: str,
+        fn: Callable[[], Dict[str, Any]],
+        private_errors: Tuple[Type[Exception], ...],
+    ) -> Dict[str, Any]:
+        r = self.redis_factory()
+        try:
+            try:
+                result = fn()
+            except private_errors:
+                raise
+            except Exception as exc:
+                self._publish(r, key, token, {"ok": False, "error": str(exc)})
+                raise
+            self._publish(r, key, token, {"ok": True, "result": result})
+            return result
+        finally:
+            try:
+                r.eval(RELEASE_LOCK, 1, self._lock_key(key), token)
+            except redis.RedisError:
+                logger.warning("Failed to release single-flight lock for %s", key, exc_info=True)
+
+    def _publish(self, r: redis.Redis, key: str, token: str, message: Dict[str, Any]):
+        payload = json.dumps(message)
+        try:
+            r.set(self._result_key(key, token), payload, px=int(self.result_ttl * 1000))
+            r.publish(self._channel(key, token), payload)
+        except redis.RedisError:
+            logger.warning("Failed to publish single-flight result for %s", key, exc_info=True)
+
+    def _wait(self, key: str, leader: str, deadline: float) -> Optional[Dict[str, Any]]:
+        """Wait for ``leader``'s answer; None if the leader vanished or time ran out
+
+        Answers are scoped to the leader's token, so a waiter never picks up
+        the result of an earlier flight for the same key.
+        """
+        r = self.redis_factory()
+        pubsub = r.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(self._channel(key, leader))
+            # Subscribed first, so an answer published before this GET is not missed
+            while time.monotonic() < deadline:
+                stored = r.get(self._result_key(key, leader))
+                if stored is not None:
+                    return json.loads(stored)
+                if r.get(self._lock_key(key)) != leader.encode():
+                    # The leader stores its answer before releasing the lock
+                    stored = r.get(self._result_key(key, leader))
+                    return json.loads(stored) if stored is not None else None
+                message = pubsub.get_message(timeout=min(1.0, max(deadline - time.monotonic(), 0)))
+                if message is not None:
+                    return json.loads(message["data"])
+            return None
+        finally:
+            pubsub.close()
+
+    @staticmethod
+    def _unpack(published: Dict[str, Any]) -> Dict[str, Any]:
+        if not published["ok"]:
+            raise SingleFlightError(published["error"])
+        return published["result"]
+
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return f"single_flight:lock:{key}"
+
+    @staticmethod
+    def _result_key(key: str, token: str) -> str:
+        return f"single_flight:result:{key}:{token}"
+
+    @staticmethod
+    def _channel(key: str, token: str) -> str:
+        return f"single_flight:done:{key}:{token}"
+
+
+single_flight = SingleFlight(
+    get_redis,
+    lock_ttl=float(os.getenv("SINGLE_FLIGHT_LOCK_SECONDS", "60")),
+    wait_timeout=float(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", "30")),
+    result_ttl=float(os.getenv("SINGLE_FLIGHT_RESULT_SECONDS", "10")),
+)
@@ -1,10 +1,13 @@
-import httpx
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+from worker.services.base_check_service import ProviderCheckService
+from worker.services.provider_gateway import ProviderGateway
 
-class SocialMediaCheckService:
-    def __init__(self):
+
+class SocialMediaCheckService(ProviderCheckService):
+    def __init__(self, gateway: Optional[ProviderGateway] = None):
+        super().__init__(gateway)
         self.api_key = os.getenv("SOCIAL_MEDIA_API_KEY")
         self.api_url = "https://api.socialmedia.com/v1/check"  # Example API
 
@@ -12,6 +15,7 @@ class SocialMediaCheckService:
         """Perform social media background check"""
         # This is a mock implementation
         # In production, you would integrate with real social media check APIs
+        # through self.call_provider(), which uses the shared provider gateway
         
         try:
             # Mock API call
@@ -1,6 +1,20 @@
 import pytest
+import sys
+import os
 from unittest.mock import patch, MagicMock
 
+# Make both ``celery_app`` and the ``worker`` package importable
+WORKER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, WORKER_DIR)
+sys.path.insert(0, os.path.dirname(WORKER_DIR))
+
+try:
+    from worker import tasks
+    TASKS_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: Could not import worker tasks: {e}")
+    TASKS_AVAILABLE = False
+
 
 def test_criminal_check_task():
     """Test the criminal check task."""
@@ -27,3 +41,539 @@ def test_identity_check_task():
 def test_social_media_check_task():
     """Test the social media check task."""
     assert True
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_process_background_check_fans_out_enabled_checks():
+    """Enabled sub-checks are dispatched together as one chord."""
+    background_check = MagicMock(
+        id=1,
+        candidate_id=2,
+        criminal_check=True,
+        education_verification=False,
+        employment_verification=True,
+        identity_verification=False,
+        social_media_check=True,
+        started_at=None,
+    )
+    background_check.organization.plan_type = "enterprise"
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = background_check
+    db.execute.return_value.rowcount = 1
+
+    with patch.object(tasks, "SessionLocal", return_value=db), \
+            patch.object(tasks, "chord") as mock_chord:
+        result = tasks.process_background_check.run(1)
+
+    header = mock_chord.call_args[0][0]
+    assert {sig.task for sig in header} == {"worker.tasks.process_check"}
+    assert [sig.args for sig in header] == [
+        (1, 1, "criminal"),
+        (1, 1, "employment"),
+        (1, 1, "social_media"),
+    ]
+    assert {sig.options["queue"] for sig in header} == {"checks.enterprise"}
+    mock_chord.return_value.assert_called_once()
+    assert result == {"status": "dispatched", "checks": 3}
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_every_check_type_has_a_registered_provider():
+    """Each CheckType resolves to a provider through the registry."""
+    from worker.models import CheckType
+    from worker.services.registry import get_provider
+
+    for check_type in CheckType:
+        provider = get_provider(check_type)
+        assert provider.check_type == check_type
+        assert provider.outcome_field in ("passed", "verified")
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_purge_check_results_deletes_in_chunks():
+    """Only rows older than the cutoff are removed, one chunk at a time."""
+    from datetime import datetime, timedelta
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from worker import retention
+    from worker.models import CheckResult, CheckType
+    from worker.models.base import Base
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    now = datetime.utcnow()
+    with session_factory() as session:
+        session.add_all(
+            CheckResult(
+                id=i + 1,
+                background_check_id=1,
+                check_type=CheckType.CRIMINAL,
+                created_at=now - timedelta(days=400 if i < 5 else 1),
+            )
+            for i in range(7)
+        )
+        session.commit()
+
+    progress = []
+    with patch.object(retention, "SessionLocal", session_factory):
+        deleted = retention.purge_check_results(
+            now - timedelta(days=365),
+            chunk_size=2,
+            on_progress=lambda total, last_id: progress.append(total),
+        )
+
+    assert deleted == 5
+    assert progress == [2, 4, 5]
+    with session_factory() as session:
+        assert session.query(CheckResult).count() == 2
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_result_cache_fingerprint_ignores_formatting():
+    """Formatting differences do not change the keyed fingerprint."""
+    from datetime import datetime
+    from worker.models import Candidate
+    from worker.services.result_cache import candidate_fingerprint
+
+    first = Candidate(first_name="Ada", last_name="Lovelace", ssn="123-45-6789",
+                      date_of_birth=datetime(1990, 12, 10), address="1 Main St.")
+    second = Candidate(first_name=" ada ", last_name="LOVELACE", ssn="123456789",
+                       date_of_birth=datetime(1990, 12, 10, 8, 30), address="1 main st")
+
+    assert candidate_fingerprint(first, key="secret") == candidate_fingerprint(second, key="secret")
+    assert candidate_fingerprint(first, key="secret") != candidate_fingerprint(first, key="other")
+    assert candidate_fingerprint(first, key="") is None
+    assert candidate_fingerprint(Candidate(first_name="Ada", last_name="Lovelace"), key="secret") is None
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_result_cache_serves_repeat_reads_from_memory():
+    """A cached answer is read back from memory without touching Redis."""
+    import threading
+    from worker.models import CheckType
+    from worker.services.result_cache import ResultCache
+
+    redis_client = MagicMock()
+    redis_client.get.return_value = None
+    cache = ResultCache(lambda: redis_client, ttls={CheckType.CRIMINAL: 60}, stats_flush_interval=3600)
+    outcome = {}
+
+    def lookups():
+        outcome["miss"] = cache.get(CheckType.CRIMINAL, "fp")
+        cache.set(CheckType.CRIMINAL, "fp", {"passed": True})
+        outcome["hit"] = cache.get(CheckType.CRIMINAL, "fp")
+
+    # Run in a thread so a lock-ordering bug fails the test instead of hanging it
+    thread = threading.Thread(target=lookups, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive(), "cache lookup deadlocked"
+
+    entry, tier = outcome["hit"]
+    assert outcome["miss"] is None
+    assert entry["result"] == {"passed": True}
+    assert tier == "memory"
+    assert redis_client.get.call_count == 1
+    redis_client.hincrby.assert_not_called()
+    assert cache.stats == {"criminal:miss": 1, "criminal:hit:memory": 1}
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_result_cache_keeps_redis_expiry_for_memory_copy():
+    """An entry read from Redis only lives in memory for its remaining TTL."""
+    import json
+    import time
+    from datetime import datetime, timedelta
+    from worker.models import CheckType
+    from worker.services.result_cache import ResultCache
+
+    redis_client = MagicMock()
+    redis_client.get.return_value = json.dumps({
+        "result": {"passed": True},
+        "cached_at": (datetime.utcnow() - timedelta(seconds=55)).isoformat(),
+    })
+    cache = ResultCache(lambda: redis_client, ttls={CheckType.CRIMINAL: 60}, stats_flush_interval=3600)
+
+    assert cache.get(CheckType.CRIMINAL, "fp")[1] == "redis"
+    expires_at, _ = cache._local[cache._key(CheckType.CRIMINAL, "fp")]
+    assert expires_at - time.monotonic() <= 5
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_process_background_check_skips_check_claimed_elsewhere():
+    """A duplicate delivery that loses the status claim dispatches nothing."""
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = MagicMock(id=1)
+    db.execute.return_value.rowcount = 0
+
+    with patch.object(tasks, "SessionLocal", return_value=db), \
+            patch.object(tasks, "chord") as mock_chord:
+        result = tasks.process_background_check.run(1)
+
+    mock_chord.assert_not_called()
+    assert result["status"] == "skipped"
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_single_flight_coalesces_concurrent_calls():
+    """Concurrent callers for one key share a single upstream call."""
+    import threading
+    import time
+    fakeredis = pytest.importorskip("fakeredis")
+    from worker.services.single_flight import SingleFlight
+
+    server = fakeredis.FakeServer()
+    flight = SingleFlight(lambda: fakeredis.FakeRedis(server=server), wait_timeout=5)
+    calls = []
+
+    def upstream():
+        calls.append(1)
+        time.sleep(0.3)
+        return {"passed": True}
+
+    results = []
+    callers = [threading.Thread(target=lambda: results.append(flight.do("criminal:fp", upstream)))
+               for _ in range(4)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join(timeout=10)
+
+    assert len(calls) == 1
+    assert results == [{"passed": True}] * 4
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_provider_limiter_throttles_and_backs_off():
+    """Calls beyond the bucket are throttled and a 429 halves concurrency."""
+    import httpx
+    fakeredis = pytest.importorskip("fakeredis")
+    from worker.models import CheckType
+    from worker.services.rate_limiter import ProviderLimiter, ProviderThrottled
+
+    server = fakeredis.FakeServer()
+    limiter = ProviderLimiter(
+        lambda: fakeredis.FakeRedis(server=server),
+        rates={CheckType.CRIMINAL: 1.0},
+        bursts={CheckType.CRIMINAL: 2},
+        max_concurrency={CheckType.CRIMINAL: 8},
+    )
+
+    throttled = httpx.HTTPStatusError(
+        "Too Many Requests",
+        request=httpx.Request("GET", "https://provider.test"),
+        response=httpx.Response(429),
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        with limiter.slot(CheckType.CRIMINAL):
+            raise throttled
+    with limiter.slot(CheckType.CRIMINAL):
+        pass
+    with pytest.raises(ProviderThrottled) as exc_info:
+        with limiter.slot(CheckType.CRIMINAL):
+            pass
+
+    r = fakeredis.FakeRedis(server=server)
+    assert 0 < exc_info.value.retry_after <= 1
+    assert 4 < float(r.get("provider_limit:criminal:concurrency")) < 5
+    assert r.zcard("provider_limit:criminal:slots") == 0
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_circuit_breaker_opens_and_recovers_through_probe():
+    """Repeated provider failures open the circuit until a probe succeeds."""
+    import time
+    import httpx
+    fakeredis = pytest.importorskip("fakeredis")
+    from worker.models import CheckType
+    from worker.services.circuit_breaker import CircuitBreaker, CircuitOpen
+
+    server = fakeredis.FakeServer()
+    breaker = CircuitBreaker(lambda: fakeredis.FakeRedis(server=server), failure_threshold=2, open_seconds=0.2)
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            with breaker.guard(CheckType.IDENTITY):
+                raise httpx.ConnectError("connection refused")
+    with pytest.raises(CircuitOpen):
+        with breaker.guard(CheckType.IDENTITY):
+            pass
+
+    time.sleep(0.25)
+    with breaker.guard(CheckType.IDENTITY):
+        pass
+    with breaker.guard(CheckType.IDENTITY):
+        pass
+    assert fakeredis.FakeRedis(server=server).exists("circuit:identity") == 0
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_fair_shares_weight_plans_and_redistribute_unused_capacity():
+    """A big basic backlog gets only its share; small backlogs free theirs up."""
+    from worker.scheduling import TenantBacklog, fair_shares
+
+    backlogs = [
+        TenantBacklog(organization_id=1, plan_type="basic", pending=5000),
+        TenantBacklog(organization_id=2, plan_type="enterprise", pending=5000),
+        TenantBacklog(organization_id=3, plan_type="premium", pending=10),
+    ]
+    shares = fair_shares(backlogs, capacity=700)
+
+    assert shares == {1: 138, 2: 552, 3: 10}
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_fair_shares_count_already_queued_checks():
+    """A tenant whose queue already holds its share is not topped up further."""
+    from worker.scheduling import TenantBacklog, fair_shares
+
+    backlogs = [
+        TenantBacklog(organization_id=1, plan_type="basic", pending=5000, queued=5000),
+        TenantBacklog(organization_id=2, plan_type="enterprise", pending=5000, queued=100),
+    ]
+    shares = fair_shares(backlogs, capacity=700)
+
+    assert shares == {1: 0, 2: 460}
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_process_background_check_only_redispatches_unfinished_types():
+    """Types that already recorded PASS/FAIL are not run again on resume."""
+    from worker.models import CheckType
+
+    background_check = MagicMock(
+        id=1,
+        candidate_id=2,
+        criminal_check=True,
+        education_verification=False,
+        employment_verification=True,
+        identity_verification=False,
+        social_media_check=True,
+        started_at=None,
+    )
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = background_check
+    db.execute.return_value.rowcount = 1
+    done = {CheckType.CRIMINAL: {"check_type": "criminal", "passed": True}}
+
+    with patch.object(tasks, "SessionLocal", return_value=db), \
+            patch.object(tasks, "completed_results", return_value=done), \
+            patch.object(tasks, "chord") as mock_chord:
+        result = tasks.process_background_check.run(1)
+
+    header = mock_chord.call_args[0][0]
+    assert [sig.args[2] for sig in header] == ["employment", "social_media"]
+    assert result == {"status": "dispatched", "checks": 2}
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_micro_batcher_answers_concurrent_lookups_with_one_bulk_call():
+    """Concurrent lookups are served by a single bulk call, each getting its own answer."""
+    import threading
+    fakeredis = pytest.importorskip("fakeredis")
+    from worker.models import CheckType
+    from worker.services.micro_batcher import MicroBatcher
+
+    server = fakeredis.FakeServer()
+    batcher = MicroBatcher(lambda: fakeredis.FakeRedis(server=server), max_items=4, max_wait=0.5, result_timeout=5)
+    service = MagicMock(supports_bulk=True)
+    service.perform_bulk_check.side_effect = lambda ids: {i: {"candidate_id": i, "passed": True} for i in ids}
+
+    results = {}
+
+    def lookup(candidate_id):
+        results[candidate_id] = batcher.perform(CheckType.CRIMINAL, service, candidate_id)
+
+    callers = [threading.Thread(target=lookup, args=(i,)) for i in range(1, 5)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join(timeout=10)
+
+    assert service.perform_bulk_check.call_count == 1
+    assert service.perform_check.call_count == 0
+    assert results == {i: {"candidate_id": i, "passed": True} for i in range(1, 5)}
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_relay_outbox_events_publishes_and_marks_events():
+    """Unpublished events are sent to their queue; failed sends are counted for the next run."""
+    import json
+
+    sent = MagicMock(payload=json.dumps({"args": [7], "kwargs": {}, "queue": "checks.premium"}), attempts=0)
+    failed = MagicMock(payload=json.dumps({"args": [8], "kwargs": {}, "queue": "checks.basic"}), attempts=0)
+    sent.task_name = failed.task_name = "worker.tasks.process_background_check"
+    db = MagicMock()
+    db.execute.return_value.scalars.return_value.all.return_value = [sent, failed]
+
+    def send_task(name, args, kwargs, queue):
+        if args == [8]:
+            raise ConnectionError("broker unavailable")
+
+    with patch.object(tasks, "SessionLocal", return_value=db), \
+            patch.object(tasks.celery_app, "send_task", side_effect=send_task) as mock_send:
+        result = tasks.relay_outbox_events.run()
+
+    assert mock_send.call_args_list[0].kwargs["queue"] == "checks.premium"
+    assert failed.attempts == 1
+    assert result == {"published": 1, "pending": 1}
+    db.commit.assert_called_once()
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_serializer_compresses_only_large_bodies():
+    """Small bodies are plain msgpack; large ones are compressed and round-trip."""
+    from worker.serialization import COMPRESS_THRESHOLD_BYTES, dumps, loads
+
+    small = {"check_type": "criminal", "status": "pass"}
+    large = {"details": ["federal", "state", "county"] * COMPRESS_THRESHOLD_BYTES}
+
+    assert dumps(small)[:1] == b"\x00"
+    assert loads(dumps(small)) == small
+    assert dumps(large)[:1] != b"\x00"
+    assert len(dumps(large)) < COMPRESS_THRESHOLD_BYTES
+    assert loads(dumps(large)) == large
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_bump_check_version_starts_from_clock_then_increments():
+    """A check's first version is time-based, so a lost key never repeats old versions."""
+    import time
+    fakeredis = pytest.importorskip("fakeredis")
+    from worker import progress
+
+    r = fakeredis.FakeRedis()
+    with patch.object(progress, "get_redis", return_value=r):
+        before = time.time_ns() // 1000
+        progress.bump_check_version(7)
+        first = int(r.get(progress.check_version_key(7)))
+        progress.bump_check_version(7)
+
+    assert first >= before
+    assert int(r.get(progress.check_version_key(7))) == first + 1
+    assert r.ttl(progress.check_version_key(7)) > 0
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_in_flight_claim_is_held_per_delivery():
+    """A second delivery is refused the claim, whatever its task id, until it is released."""
+    fakeredis = pytest.importorskip("fakeredis")
+    from worker.checkpoints import InFlightClaims
+
+    server = fakeredis.FakeServer()
+    claims = InFlightClaims(lambda: fakeredis.FakeRedis(server=server), ttl=600, max_poll=60)
+
+    assert claims.claim("1:criminal", "delivery-a")
+    assert not claims.claim("1:criminal", "delivery-b")
+    assert claims.retry_after("1:criminal") == 60
+    claims.release("1:criminal", "delivery-a")
+    assert claims.claim("1:criminal", "delivery-b")
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_recorded_result_fills_in_the_pending_placeholder():
+    """The worker completes the row created when the check started instead of adding one."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from worker import executor
+    from worker.models import CheckResult, CheckType, ResultStatus
+    from worker.models.base import Base
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        session.add(CheckResult(id=1, background_check_id=1, check_type=CheckType.CRIMINAL, status=ResultStatus.PENDING))
+        session.commit()
+
+    with patch.object(executor, "SessionLocal", session_factory):
+        executor._record_result({
+            "background_check_id": 1,
+            "check_type": CheckType.CRIMINAL,
+            "status": ResultStatus.PASS,
+            "result_data": "{}",
+            "error_message": None,
+        })
+
+    with session_factory() as session:
+        rows = session.query(CheckResult).all()
+    assert [(row.id, row.status) for row in rows] == [(1, ResultStatus.PASS)]
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_purge_outbox_events_keeps_unpublished_and_recent_events():
+    """Only events published before the cutoff are deleted."""
+    from datetime import datetime, timedelta
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from worker import retention
+    from worker.models import OutboxEvent
+    from worker.models.base import Base
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    now = datetime.utcnow()
+    published = [now - timedelta(hours=48)] * 3 + [now - timedelta(hours=1), None]
+    with session_factory() as session:
+        session.add_all(
+            OutboxEvent(id=i + 1, task_name="worker.tasks.process_background_check", payload="{}", published_at=at)
+            for i, at in enumerate(published)
+        )
+        session.commit()
+
+    with patch.object(retention, "SessionLocal", session_factory):
+        purged = retention.purge_outbox_events(now - timedelta(hours=24), chunk_size=2)
+
+    assert purged == 3
+    with session_factory() as session:
+        assert [event.id for event in session.query(OutboxEvent).order_by(OutboxEvent.id)] == [4, 5]
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_provider_gateway_close_closes_async_clients():
+    """Async clients are closed, not just dropped, when the gateway shuts down."""
+    import asyncio
+    import httpx
+    from worker.services.provider_gateway import ProviderGateway
+
+    gateway = ProviderGateway()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+
+    async def call():
+        gateway._async_clients["https://provider.test"] = httpx.AsyncClient(transport=transport)
+        return await gateway.arequest("GET", "https://provider.test/check")
+
+    asyncio.run(call())
+    client = gateway._async_clients["https://provider.test"]
+    gateway.close()
+
+    assert client.is_closed
+    assert gateway._async_clients == {}
+
+
+@pytest.mark.skipif(not TASKS_AVAILABLE, reason="Worker tasks not available")
+def test_provider_limiter_keeps_tokens_when_no_slot_is_free():
+    """A call deferred for want of a concurrency slot does not spend a token."""
+    fakeredis = pytest.importorskip("fakeredis")
+    from worker.models import CheckType
+    from worker.services.rate_limiter import ProviderLimiter, ProviderThrottled
+
+    server = fakeredis.FakeServer()
+    limiter = ProviderLimiter(
+        lambda: fakeredis.FakeRedis(server=server),
+        rates={CheckType.CRIMINAL: 0.001},
+        bursts={CheckType.CRIMINAL: 2},
+        max_concurrency={CheckType.CRIMINAL: 1},
+    )
+
+    with limiter.slot(CheckType.CRIMINAL):
+        for _ in range(3):
+            with pytest.raises(ProviderThrottled):
+                with limiter.slot(CheckType.CRIMINAL):
+                    pass
+    with limiter.slot(CheckType.CRIMINAL):
+        pass
+
+    assert fakeredis.FakeRedis(server=server).zcard("provider_limit:criminal:slots") == 0